@@ -0,0 +1,60 @@
+# Repaint cost of a drawing surface on an 854x480 canvas: drawing a segment and repainting it straight from the
+# shared PIL/QImage buffer, against the tobytes -> QImage -> QPixmap round trip every repaint used to make.
+# Run from the repository root: python bench/canvas_repaint.py
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QPoint
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtWidgets import QApplication
+
+
+def measure(run, count):
+    # (microseconds per call, peak Python allocation in KB)
+    tracemalloc.start()
+    started = time.perf_counter()
+    for i in range(count):
+        run(i)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed / count * 1e6, peak / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drawing surface repaint cost, shared buffer against a copy.")
+    parser.add_argument("--repeat", type=int, default=200)
+    options = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication([])
+    from csbp_v1 import BigDrawingDialog
+
+    dialog = BigDrawingDialog()
+    dialog.show()
+    app.processEvents()
+
+    def shared(i):
+        dialog.draw_polyline([QPoint(10 + i % 800, 10), QPoint(20 + i % 800, 30)])
+        dialog.label.repaint()
+
+    def round_trip(i):
+        image = dialog.image
+        data = image.tobytes("raw", "RGBA")
+        QPixmap.fromImage(QImage(data, image.width, image.height, QImage.Format_RGBA8888))
+
+    shared(0)
+    round_trip(0)
+    for name, run in (("shared buffer, draw + repaint", shared), ("tobytes -> QImage -> QPixmap", round_trip)):
+        micros, peak = measure(run, options.repeat)
+        print(f"{name:32} {micros:8.0f} us   Python allocation peak {peak:8.0f} KB")
+    dialog.close()
+
+
+if __name__ == "__main__":
+    main()
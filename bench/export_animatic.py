@@ -0,0 +1,112 @@
+# Animatic export of a 200-cut board of 854x480 sketches at 1920x1080: streamed into ffmpeg's stdin, and written as
+# a PNG sequence with hard-linked repeats. Without ffmpeg on PATH or in CSBP_FFMPEG the pipe is drained by a
+# stand-in that only counts the bytes, so the rendering and piping are measured but not the encoding.
+# Run from the repository root: python bench/export_animatic.py
+import argparse
+import os
+import random
+import stat
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw
+
+from storyboard_planner.export import EXPORT_SIZE, FFMPEG_ENV, export_animatic, find_ffmpeg
+from storyboard_planner.playback import Timeline
+from storyboard_planner.tiles import TiledImage
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+STAND_IN_ENCODER = """#!{python}
+# Drains stdin like ffmpeg would and writes the byte count to the output path
+import sys
+total = 0
+while True:
+    data = sys.stdin.buffer.read(1 << 20)
+    if not data:
+        break
+    total += len(data)
+with open(sys.argv[-1], "w") as f:
+    f.write(str(total))
+"""
+
+
+def sketch(rng):
+    image = Image.new("RGBA", (854, 480), (255, 255, 255, 255))
+    draw = ImageDraw.Draw(image)
+    for _ in range(60):
+        draw.line([(rng.randrange(854), rng.randrange(480)) for _ in range(6)], fill=(0, 0, 0, 255), width=3)
+    return TiledImage.from_image(image)
+
+
+def peak_rss_mb():
+    if resource is None:
+        return float("nan")
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def disk_usage_mb(directory):
+    # Hard-linked repeats share one inode, count each once
+    seen, total = set(), 0
+    for entry in os.scandir(directory):
+        info = entry.stat()
+        if info.st_ino not in seen:
+            seen.add(info.st_ino)
+            total += info.st_size
+    return total / 1024 ** 2
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Animatic export time and memory, ffmpeg pipe and PNG sequence.")
+    parser.add_argument("--cuts", type=int, default=200)
+    parser.add_argument("--fps", type=int, default=24)
+    parser.add_argument("--mode", choices=["pipe", "sequence", "both"], default="both")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=3)
+    options = parser.parse_args(argv)
+
+    rng = random.Random(options.seed)
+    frames = [sketch(rng) for _ in range(options.cuts)]
+    durations = [(rng.randint(1, 3), rng.randint(0, 23)) for _ in range(options.cuts)]
+    numbers = list(range(1, options.cuts + 1))
+    descriptions = ["pan left, hold"] * options.cuts
+    total_frames = Timeline(durations, options.fps).total_frames
+    print(f"{options.cuts} cuts, {total_frames} frames at {options.fps} fps, board loaded: {peak_rss_mb():.0f} MB")
+
+    with tempfile.TemporaryDirectory() as directory:
+        stand_in = not find_ffmpeg()
+        if stand_in:
+            encoder = os.path.join(directory, "ffmpeg-stand-in")
+            with open(encoder, "w") as f:
+                f.write(STAND_IN_ENCODER.format(python=sys.executable))
+            os.chmod(encoder, os.stat(encoder).st_mode | stat.S_IXUSR)
+            os.environ[FFMPEG_ENV] = encoder
+
+        modes = ["pipe", "sequence"] if options.mode == "both" else [options.mode]
+        for mode in modes:
+            # No video extension, so the sequence run never goes through ffmpeg
+            filename = os.path.join(directory, "animatic.mp4" if mode == "pipe" else "animatic")
+            started = time.perf_counter()
+            path = export_animatic(filename, frames, durations, numbers, descriptions, options.fps,
+                                   workers=options.workers)
+            elapsed = time.perf_counter() - started
+            if mode == "sequence":
+                detail = f"{len(os.listdir(path))} files, {disk_usage_mb(path):.0f} MB on disk"
+            elif stand_in:
+                with open(path) as f:
+                    piped = int(f.read())
+                expected = total_frames * EXPORT_SIZE[0] * EXPORT_SIZE[1] * 3
+                detail = f"{piped / 1e9:.1f} GB piped to a stand-in encoder, byte-exact: {piped == expected}"
+            else:
+                detail = f"{os.path.getsize(path) / 1024 ** 2:.1f} MB video"
+            print(f"{mode:9} {elapsed:6.1f} s   peak RSS {peak_rss_mb():.0f} MB   {detail}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# Cost of the playback timecode overlay: the five-pass draw.text layer against one put together from cached
+# per-glyph sprites, averaged over the 240 timecode strings of a 10 second cut, at three font sizes. Also checks
+# how far the sprites drift from draw.text once pasted on a frame.
+# Run from the repository root: python bench/text_sprites.py
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageChops, ImageDraw
+
+from storyboard_planner.fonts import get_font
+from storyboard_planner.sprites import draw_shadowed_text, paste_text, text_layer, text_sprites
+
+
+def per_text(run, texts, font):
+    started = time.perf_counter()
+    for text in texts:
+        run(text, font, 2)
+    return (time.perf_counter() - started) / len(texts) * 1e3
+
+
+def largest_difference(text, font):
+    # Glyph sprites pasted on a frame against draw.text straight onto it, as the player drew the timecode before
+    frame = Image.new("RGBA", (40 + font.size * 8, 40 + font.size * 2), (90, 140, 200, 255))
+    drawn, pasted = frame.copy(), frame.copy()
+    draw_shadowed_text(ImageDraw.Draw(drawn), (20, 20), text, font, 2)
+    paste_text(pasted, (20, 20), text, font, 2, glyphs=True)
+    return max(high for low, high in ImageChops.difference(drawn.convert("RGB"), pasted.convert("RGB")).getextrema())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Timecode overlay cost, draw.text against glyph sprites.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[24, 54, 108])
+    options = parser.parse_args(argv)
+
+    texts = [f"{seconds:02d}s + {frames:02d}f" for seconds in range(10) for frames in range(24)]
+    print("font size  draw.text x5   glyph sprites   largest channel difference")
+    for size in options.sizes:
+        font = get_font(size)
+        # Render every glyph once so the sprite timing is the steady state seen during playback
+        text_sprites.glyph_layer("".join(sorted(set("".join(texts)))), font, 2)
+        slow = per_text(text_layer, texts, font)
+        fast = per_text(text_sprites.glyph_layer, texts, font)
+        difference = max(largest_difference(text, font) for text in texts)
+        print(f"{size:9}  {slow:9.2f} ms   {fast:10.2f} ms   {difference}")
+
+
+if __name__ == "__main__":
+    main()
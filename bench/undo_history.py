@@ -0,0 +1,76 @@
+# Undo history cost in the drawing dialog: random strokes are drawn through the mouse handlers on an 854x480
+# canvas, then undone and redone. Reports history memory per stroke, undo/redo time per step, and how many
+# strokes a small budget keeps.
+# Run from the repository root: python bench/undo_history.py
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QEvent, QPointF, Qt
+from PySide6.QtGui import QMouseEvent
+from PySide6.QtWidgets import QApplication
+
+
+def mouse_event(kind, x, y, button=Qt.LeftButton):
+    return QMouseEvent(kind, QPointF(x, y), QPointF(x, y), button, button, Qt.NoModifier)
+
+
+def draw_strokes(dialog, count, rng, moves=10, step=(3, 2)):
+    for _ in range(count):
+        x, y = rng.randrange(50, 800), rng.randrange(50, 430)
+        dialog.mousePressEvent(mouse_event(QEvent.MouseButtonPress, x, y))
+        for move in range(moves):
+            dialog.mouseMoveEvent(mouse_event(QEvent.MouseMove, x + move * step[0], y + move * step[1]))
+        dialog.mouseReleaseEvent(mouse_event(QEvent.MouseButtonRelease, 0, 0, Qt.NoButton))
+
+
+def timed(run, count):
+    started = time.perf_counter()
+    for _ in range(count):
+        run()
+    return (time.perf_counter() - started) / count * 1e3
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Undo history memory and latency in the drawing dialog.")
+    parser.add_argument("--strokes", type=int, default=100)
+    parser.add_argument("--small-budget", type=int, default=50_000, help="bytes, for the eviction check")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication([])
+    from csbp_v1 import BigDrawingDialog
+
+    rng = random.Random(options.seed)
+    dialog = BigDrawingDialog()
+    dialog.show()
+    app.processEvents()
+    blank = dialog.image.tobytes()
+    draw_strokes(dialog, options.strokes, rng)
+    drawn = dialog.image.tobytes()
+
+    history = dialog.history
+    full_copy = dialog.image.width * dialog.image.height * 4
+    print(f"strokes recorded     {len(history.undo_stack)}")
+    print(f"history per stroke   {history.nbytes / options.strokes / 1024:.1f} KB "
+          f"(a full copy is {full_copy / 1024:.0f} KB)")
+    print(f"undo                 {timed(dialog.undo, options.strokes):.2f} ms per step, "
+          f"back to blank: {dialog.image.tobytes() == blank}")
+    print(f"redo                 {timed(dialog.redo, options.strokes):.2f} ms per step, "
+          f"back to drawn: {dialog.image.tobytes() == drawn}")
+    dialog.close()
+
+    small = BigDrawingDialog(history_budget=options.small_budget)
+    draw_strokes(small, options.strokes, rng, moves=2, step=(30, 20))
+    print(f"{options.small_budget} byte budget keeps the newest {len(small.history.undo_stack)} strokes "
+          f"({small.history.nbytes} bytes)")
+    small.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,54 @@
-import io
+import os
 import sys
-import json
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
-    QTableWidgetItem, QPushButton, QLabel, QComboBox, QFileDialog, QMessageBox, QColorDialog,
-    QCheckBox, QDialog, QSizePolicy, QLineEdit, QMenuBar, QAbstractItemView, QSlider
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTableView, QStyledItemDelegate,
+    QStyleOptionButton, QStyle, QPushButton, QLabel, QComboBox, QFileDialog, QMessageBox, QColorDialog,
+    QCheckBox, QDialog, QSizePolicy, QLineEdit, QMenuBar, QAbstractItemView, QSlider, QProgressBar
 )
 
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QPixmap, QImage, QAction, QPainter, QIcon
+from PySide6.QtCore import (
+    Qt, QTimer, QRect, QStandardPaths, QObject, QRunnable, QThreadPool, Signal, QAbstractTableModel, QModelIndex
+)
+from PySide6.QtGui import QPixmap, QImage, QAction, QPainter, QIcon, QShortcut, QKeySequence, QColor, QIntValidator
 
 from images import FAVICON
+from storyboard_planner.autosave import AutosaveJournal, load_autosave, rotate_autosave
+from storyboard_planner.board import DURATION_MAX, Board
+from storyboard_planner.export import VIDEO_EXTENSIONS, export_animatic
+from storyboard_planner.fonts import get_font
+from storyboard_planner.history import StrokeHistory, DEFAULT_HISTORY_BUDGET
+from storyboard_planner.imports import IMAGE_EXTENSIONS, BulkImport, importer, is_image_file, list_images
+from storyboard_planner.playback import PlaybackClock, Timeline, format_timecode
+from storyboard_planner.project import (
+    PROJECT_EXTENSION, LEGACY_EXTENSION, panel_cache, save_project_file, load_project_file, resolve_panel,
+    snapshot_panel, snapshot_pages
+)
+from storyboard_planner.render import PLAYBACK_LOOKAHEAD, FramePrefetcher, compose_cut_frame, fit_size
+from storyboard_planner.sprites import text_sprites
+from storyboard_planner.strokes import StrokeList, VectorDrawing
+from storyboard_planner.thumbnails import thumbnails
+from storyboard_planner.tiles import TiledImage
 
-from ctypes import windll
+# The taskbar app id only exists on Windows
+if sys.platform == "win32":
+    from ctypes import windll
 
-windll.shell32.SetCurrentProcessExplicitAppUserModelID('Ginyoa.Crappy.Storyboard.Planner')
+    windll.shell32.SetCurrentProcessExplicitAppUserModelID('Ginyoa.Crappy.Storyboard.Planner')
 
 
 
 DEFAULT_FPS = 24
 ROWS_PER_PAGE = 6
 COLS = 4
-TOTAL_PAGES = 4
+# A new board starts with this many pages, more are added as needed
+DEFAULT_PAGE_COUNT = 4
 
 # NOTE - StevenPince - Using 854 x 480 (FWVGA) resolution at 16:9 aspect ratio
 DEFAULT_WIDTH = 854
@@ -33,66 +57,200 @@ DEFAULT_HEIGHT = 480
 COLOR_WHITE = (255, 255, 255, 255)
 COLOR_BLACK = (0, 0, 0, 255)
 
+# Pointer samples are queued and drawn once per display frame (~60 Hz)
+STROKE_FRAME_INTERVAL_MS = 16
 
-class DrawingWidget(QWidget):
-    def __init__(self, width, height, brush_color=COLOR_BLACK, brush_size=2, eraser_mode=False, parent=None):
-        super().__init__(parent)
-        self.setFixedSize(width, height)
-        self.image = Image.new("RGBA", (width, height), COLOR_WHITE)
-        self.draw = ImageDraw.Draw(self.image)
-        self.brush_color = brush_color
-        self.brush_size = brush_size
-        self.eraser_mode = eraser_mode
-        self.last_pos = None
+AUTOSAVE_INTERVAL_MS = 30 * 1000
 
-        self.label = QLabel(self)
-        self.label.setFixedSize(width, height)
-        self.label.move(0,0)
+PLAYBACK_RESIZE_DELAY_MS = 100
+TABLE_RESIZE_DELAY_MS = 150
+PLAYBACK_TICKS_PER_FRAME = 2
 
-        self.update_pixmap()
+log = logging.getLogger("storyboard_planner")
 
-        self.label.mousePressEvent = self.mousePressEvent
-        self.label.mouseMoveEvent = self.mouseMoveEvent
-        self.label.mouseReleaseEvent = self.mouseReleaseEvent
 
-    @property
-    def fill_color(self):
-        return (255, 255, 255, 0) if self.eraser_mode else self.brush_color
+def stroke_bounds(points, radius, width, height):
+    # Box around a stroke segment, padded by the brush radius and clipped to the canvas
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    pad = radius + 2
+    left = max(0, min(xs) - pad)
+    top = max(0, min(ys) - pad)
+    right = min(width, max(xs) + pad + 1)
+    bottom = min(height, max(ys) + pad + 1)
+    if left >= right or top >= bottom:
+        return None
+    return left, top, right, bottom
 
-    def update_pixmap(self):
-        data = self.image.tobytes("raw", "RGBA")
-        qimg = QImage(data, self.image.width, self.image.height, QImage.Format_RGBA8888)
-        pix = QPixmap.fromImage(qimg)
-        self.label.setPixmap(pix)
 
-    def get_pil_image(self):
-        return self.image.copy()
+class ProjectTaskSignals(QObject):
+    progress = Signal(int, int)
+    finished = Signal(object)
+    failed = Signal(str)
 
-    def mouseMoveEvent(self, event):
-        if self.last_pos is not None:
-            pos = event.position().toPoint() if hasattr(event, 'position') else event.pos()
-            self.draw_line(self.last_pos, pos)
-            self.last_pos = pos
 
-    def mouseReleaseEvent(self, event):
-        self.last_pos = None
+class ProjectTask(QRunnable):
+    # Runs a project save/load function on the thread pool; its signals are delivered on the GUI thread
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = ProjectTaskSignals()
 
-    def draw_point(self, pos):
-        self.draw.ellipse(xy=[pos.x() - self.brush_size,
-                              pos.y() - self.brush_size,
-                              pos.x() + self.brush_size,
-                              pos.y() + self.brush_size],
-                          fill=self.fill_color)
+    def run(self):
+        try:
+            result = self.fn(*self.args, progress=self.signals.progress.emit)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+
+class StrokeBatcher:
+    # Collects pointer samples between frame ticks and hands them to render_callback as one polyline,
+    # so the cost of a stroke follows the display rate instead of the input device report rate.
+    def __init__(self, render_callback, parent=None):
+        self.render_callback = render_callback
+        self.pending = []
+        self.events_received = 0
+        self.frames_rendered = 0
+
+        self.timer = QTimer(parent)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(STROKE_FRAME_INTERVAL_MS)
+        self.timer.timeout.connect(self.flush)
+
+    def add(self, start, end):
+        if not self.pending:
+            self.pending.append(start)
+        self.pending.append(end)
+        self.events_received += 1
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        if len(self.pending) < 2:
+            self.timer.stop()
+            return
+        self.render_callback(self.pending)
+        self.frames_rendered += 1
+        self.pending = [self.pending[-1]]
+
+    def finish(self):
+        self.flush()
+        self.timer.stop()
+        self.pending = []
+        if self.events_received:
+            log.debug("stroke: %d pointer events, %d frames rendered", self.events_received, self.frames_rendered)
+        self.events_received = 0
+        self.frames_rendered = 0
+
+
+class SharedCanvas:
+    # One pixel buffer shared by the PIL image we draw on and the QImage we show
+    def __init__(self, width, height, color=COLOR_WHITE):
+        self.width = width
+        self.height = height
+        self.buffer = bytearray(bytes(color) * (width * height))
+        self.image = Image.frombuffer("RGBA", (width, height), self.buffer, "raw", "RGBA", 0, 1)
+        self.image.readonly = 0  # otherwise PIL copies the buffer on the first write
+        self.qimage = QImage(self.buffer, width, height, width * 4, QImage.Format_RGBA8888)
+
+    @classmethod
+    def from_image(cls, pil_image):
+        canvas = cls(pil_image.width, pil_image.height)
+        canvas.image.paste(pil_image.convert("RGBA"), (0, 0))
+        return canvas
+
+
+class CanvasLabel(QWidget):
+    # Paints straight from the canvas' shared QImage, only repainting the damaged region of it
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.canvas = None
+
+    def set_canvas(self, canvas):
+        self.canvas = canvas
+        self.update()
+
+    def damage(self, box=None):
+        if box is None:
+            self.update()
+            return
+        left, top, right, bottom = box
+        self.update(QRect(left, top, right - left, bottom - top))
+
+    def paintEvent(self, event):
+        if self.canvas is None:
+            return
+        painter = QPainter(self)
+        rect = event.rect()
+        painter.drawImage(rect, self.canvas.qimage, rect)
+        painter.end()
 
-        self.update_pixmap()
 
-    def draw_line(self, start, end):
-        self.draw.line([start.x(), start.y(), end.x(), end.y()], fill=self.fill_color, width=self.brush_size * 2)
+def pil_to_qpixmap(pil_image):
+    pil_image = pil_image.convert("RGBA")
+    data = pil_image.tobytes("raw", "RGBA")
+    qimg = QImage(data, pil_image.width, pil_image.height, QImage.Format_RGBA8888)
+    return QPixmap.fromImage(qimg)
+
+
+class PlaybackView(QWidget):
+    # The cut frame is uploaded once per cut, the timecode is a small overlay repainted on top
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.frame = None
+        self.overlays = {}  # name -> (QPixmap, x, y) in frame coordinates
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def set_frame(self, pil_image):
+        self.frame = pil_to_qpixmap(pil_image)
+        self.update()
+
+    def set_overlay(self, name, pil_image, pos):
+        old = self.overlays.get(name)
+        self.overlays[name] = (pil_to_qpixmap(pil_image), pos[0], pos[1])
+        self.update(self.overlay_rect(name))
+        if old is not None:
+            self.update(self.overlay_rect_of(old))
+
+    def frame_rect(self):
+        # Where the frame lands in the widget, normally the whole widget since frames are rendered at our size
+        if self.frame is None:
+            return QRect(0, 0, self.width(), self.height())
+        size = self.frame.size().scaled(self.size(), Qt.KeepAspectRatio)
+        return QRect((self.width() - size.width()) // 2, (self.height() - size.height()) // 2,
+                     size.width(), size.height())
+
+    def overlay_rect(self, name):
+        return self.overlay_rect_of(self.overlays[name])
+
+    def overlay_rect_of(self, overlay):
+        pixmap, x, y = overlay
+        target = self.frame_rect()
+        scale = target.width() / self.frame.width() if self.frame is not None else 1
+        # One pixel of slack for smooth scaling
+        return QRect(target.x() + int(x * scale) - 1, target.y() + int(y * scale) - 1,
+                     int(pixmap.width() * scale) + 3, int(pixmap.height() * scale) + 3)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), Qt.black)
+        if self.frame is not None:
+            target = self.frame_rect()
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.drawPixmap(target, self.frame)
+            painter.translate(target.x(), target.y())
+            painter.scale(target.width() / self.frame.width(), target.height() / self.frame.height())
+            for pixmap, x, y in self.overlays.values():
+                painter.drawPixmap(x, y, pixmap)
+        painter.end()
 
-        self.update_pixmap()
 
 class BigDrawingDialog(QDialog):
-    def __init__(self, pil_image=None, brush_color=COLOR_BLACK, brush_size=5, eraser_mode=False, parent=None):
+    def __init__(self, pil_image=None, brush_color=COLOR_BLACK, brush_size=5, eraser_mode=False,
+                 history_budget=DEFAULT_HISTORY_BUDGET, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Storyboard Canvas")
         self.canvas_width = DEFAULT_WIDTH
@@ -100,14 +258,37 @@ class BigDrawingDialog(QDialog):
         self.resize(DEFAULT_WIDTH, DEFAULT_HEIGHT)
         layout = QVBoxLayout(self)
 
-        if pil_image:
-            self.image = pil_image.resize((self.canvas_width, self.canvas_height), Image.LANCZOS).copy()
+        # New strokes are recorded as vectors on top of the panel's existing strokes, whatever raster the
+        # panel had before becomes the background. Panels already at canvas size are edited in place and
+        # only their damaged tiles are written back.
+        source_tiles = None
+        if isinstance(pil_image, VectorDrawing) and pil_image.size == (self.canvas_width, self.canvas_height):
+            self.background = pil_image.background
+            self.strokes = pil_image.strokes.copy()
+            source_tiles = pil_image.to_tiles()
+            pil_image = source_tiles.to_image()
         else:
-            self.image = Image.new("RGBA", (self.canvas_width, self.canvas_height), COLOR_WHITE)
+            self.background = pil_image
+            self.strokes = StrokeList(self.canvas_width, self.canvas_height)
+        self.redo_strokes = []
+        self.stroke_open = False
+
+        if pil_image and pil_image.size == (self.canvas_width, self.canvas_height):
+            if isinstance(pil_image, TiledImage):
+                source_tiles = pil_image
+                pil_image = pil_image.to_image()
+            self.canvas = SharedCanvas.from_image(pil_image)
+        elif pil_image:
+            self.canvas = SharedCanvas.from_image(pil_image.resize((self.canvas_width, self.canvas_height), Image.LANCZOS))
+        else:
+            self.canvas = SharedCanvas(self.canvas_width, self.canvas_height)
 
+        self.image = self.canvas.image
         self.draw = ImageDraw.Draw(self.image)
+        self.history = StrokeHistory(self.image, memory_budget=history_budget, tiles=source_tiles)
+        self.stroke_boxes = []
 
-        self.label = QLabel()
+        self.label = CanvasLabel()
         self.label.setFixedSize(self.canvas_width, self.canvas_height)
         self.label.setMouseTracking(True)
         layout.addWidget(self.label)
@@ -131,6 +312,17 @@ class BigDrawingDialog(QDialog):
         self.eraser_checkbox.toggled.connect(self.eraser_toggled)
         toolbar.addWidget(self.eraser_checkbox)
 
+        self.undo_btn = QPushButton("Undo")
+        self.undo_btn.clicked.connect(self.undo)
+        toolbar.addWidget(self.undo_btn)
+
+        self.redo_btn = QPushButton("Redo")
+        self.redo_btn.clicked.connect(self.redo)
+        toolbar.addWidget(self.redo_btn)
+
+        QShortcut(QKeySequence.Undo, self, self.undo)
+        QShortcut(QKeySequence.Redo, self, self.redo)
+
         layout.addLayout(toolbar)
 
         btn_layout = QHBoxLayout()
@@ -151,8 +343,10 @@ class BigDrawingDialog(QDialog):
         self.eraser_mode = eraser_mode
 
         self.last_pos = None
+        self.stroke_batcher = StrokeBatcher(self.draw_polyline, parent=self)
 
-        self.update_pixmap()
+        self.label.set_canvas(self.canvas)
+        self.update_history_buttons()
 
         self.label.mousePressEvent = self.mousePressEvent
         self.label.mouseMoveEvent = self.mouseMoveEvent
@@ -169,11 +363,50 @@ class BigDrawingDialog(QDialog):
     def eraser_toggled(self, checked):
         self.eraser_mode = checked
 
-    def update_pixmap(self):
-        data = self.image.tobytes("raw", "RGBA")
-        qimg = QImage(data, self.image.width, self.image.height, QImage.Format_RGBA8888)
-        pix = QPixmap.fromImage(qimg)
-        self.label.setPixmap(pix)
+    def update_pixmap(self, box=None):
+        self.stroke_boxes.append(box or (0, 0, self.canvas_width, self.canvas_height))
+        self.label.damage(box)
+
+    def begin_stroke(self, pos):
+        self.strokes.begin(self.brush_color, self.brush_size * 2, self.eraser_mode)
+        self.strokes.add_points([(pos.x(), pos.y())])
+        self.stroke_open = True
+
+    def commit_stroke(self):
+        delta = None
+        if self.stroke_boxes:
+            delta = self.history.commit(self.image, self.stroke_boxes)
+            self.stroke_boxes = []
+        if self.stroke_open:
+            # Strokes stay in step with the undo history: one that changed nothing is dropped
+            if delta is None:
+                self.strokes.pop_stroke()
+            else:
+                self.redo_strokes = []
+            self.stroke_open = False
+        self.update_history_buttons()
+
+    def update_history_buttons(self):
+        self.undo_btn.setEnabled(self.history.can_undo())
+        self.redo_btn.setEnabled(self.history.can_redo())
+
+    def undo(self):
+        if self.last_pos is not None:
+            return
+        box = self.history.undo(self.image)
+        if box:
+            self.redo_strokes.append(self.strokes.pop_stroke())
+            self.label.damage(box)
+        self.update_history_buttons()
+
+    def redo(self):
+        if self.last_pos is not None:
+            return
+        box = self.history.redo(self.image)
+        if box:
+            self.strokes.append_stroke(*self.redo_strokes.pop())
+            self.label.damage(box)
+        self.update_history_buttons()
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -184,29 +417,42 @@ class BigDrawingDialog(QDialog):
     def mouseMoveEvent(self, event):
         if self.last_pos:
             pos = event.position().toPoint() if hasattr(event, 'position') else event.pos()
-            self.draw_line(self.last_pos, pos)
+            self.stroke_batcher.add(self.last_pos, pos)
             self.last_pos = pos
 
     def mouseReleaseEvent(self, event):
+        self.stroke_batcher.finish()
         self.last_pos = None
+        self.commit_stroke()
 
     def draw_point(self, pos):
+        self.begin_stroke(pos)
         self.draw.ellipse(
             [pos.x() - self.brush_size, pos.y() - self.brush_size,
              pos.x() + self.brush_size, pos.y() + self.brush_size],
             fill=COLOR_WHITE if self.eraser_mode else self.brush_color)
 
-        self.update_pixmap()
+        box = stroke_bounds([(pos.x(), pos.y())], self.brush_size,
+                             self.canvas_width, self.canvas_height)
+        if box:
+            self.update_pixmap(box)
 
-    def draw_line(self, start, end):
-        self.draw.line([start.x(), start.y(), end.x(), end.y()],
-                       fill=COLOR_WHITE if self.eraser_mode else self.brush_color,
-                       width=self.brush_size * 2)
+    def draw_polyline(self, positions):
+        if not self.stroke_open:
+            self.begin_stroke(positions[0])
+        points = [(p.x(), p.y()) for p in positions]
+        self.strokes.add_points(points[1:])
+        self.draw.line(points, fill=COLOR_WHITE if self.eraser_mode else self.brush_color,
+                       width=self.brush_size * 2, joint="curve")
 
-        self.update_pixmap()
+        box = stroke_bounds(points, self.brush_size, self.canvas_width, self.canvas_height)
+        if box:
+            self.update_pixmap(box)
 
-    def get_image(self):
-        return self.image.copy()
+    def get_drawing(self):
+        self.stroke_batcher.flush()
+        self.commit_stroke()
+        return VectorDrawing(self.strokes.copy(), background=self.background, tiles=self.history.committed.copy())
 
 class DurationWidget(QWidget):
     def __init__(self, fps=DEFAULT_FPS, parent=None):
@@ -218,6 +464,8 @@ class DurationWidget(QWidget):
 
         for edit in (self.seconds_edit, self.frames_edit):
             edit.setFixedWidth(30)
+            # Same range the board clamps to, so what is shown is what gets stored
+            edit.setValidator(QIntValidator(0, DURATION_MAX, edit))
 
         layout.addWidget(QLabel("("))
         layout.addWidget(self.seconds_edit)
@@ -248,290 +496,466 @@ class DurationWidget(QWidget):
             f = 0
         return s, f
 
-class StoryboardTable(QTableWidget):
-    def __init__(self, page_number=1, fps=DEFAULT_FPS, start_number=1, parent=None):
-        super().__init__(ROWS_PER_PAGE, COLS, parent)
-        self.page_number = page_number
-        self.fps = fps
-        self.start_number = start_number
-        self.duration_widgets = []
-        self.uploaded_images = [None] * ROWS_PER_PAGE
-        self.draw_widgets = [None] * ROWS_PER_PAGE  # Store drawing widgets if in draw mode
-        self.mode = "upload"  # def
+    def set_duration(self, s, f):
+        # Only touch the text when the value differs, so the edit being typed into keeps its cursor
+        if self.get_duration() != (s, f):
+            for edit, value in ((self.seconds_edit, s), (self.frames_edit, f)):
+                # The value comes from the board, it does not need writing back
+                edit.blockSignals(True)
+                edit.setText(str(value))
+                edit.blockSignals(False)
+
+# Pages are a model/view pair, the delegates paint straight from the board and only the edited cell gets an editor
+PANEL_ROLE = Qt.UserRole
+UPLOAD_BUTTON_SIZE = (150, 85)
+IMAGE_FILTER = "Images ({})".format(" ".join("*" + extension for extension in IMAGE_EXTENSIONS))
+THUMBNAIL_PIXMAPS = 96
+THUMBNAIL_PLACEHOLDER = (235, 235, 235, 255)
+
+
+class PanelThumbnails(QObject):
+    # QPixmaps for the panel cells, shared by both page views. A missing size is asked of the thumbnail service
+    # and arrives later through ready, which is emitted from its worker threads and delivered on the GUI thread.
+    ready = Signal(object, object)
+    updated = Signal()
+
+    def __init__(self, capacity=THUMBNAIL_PIXMAPS, parent=None):
+        super().__init__(parent)
+        self.capacity = capacity
+        self.pixmaps = OrderedDict()  # (cut, version, size, keep_aspect) -> QPixmap
+        self.batches = []  # [(requests still missing, on_done)]
+        self.failed = set()  # (cut, version) of panels that could not be read, they are not asked for again
+        self.hits = 0
+        self.misses = 0
+        self.ready.connect(self.on_ready)
+
+    def get(self, cut, size, keep_aspect, wait=False):
+        # (pixmap, exact). On a miss the largest pixmap of the same panel at another size is returned with
+        # exact False for the caller to stretch until the right one comes in, or None if there is none.
+        # wait=True only asks for the missing size when there is no stand-in to show meanwhile.
+        if (cut, cut.version) in self.failed:
+            return None, False
+        request = (cut, cut.version, size, keep_aspect)
+        pixmap = self.pixmaps.get(request)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(request)
+            self.hits += 1
+            return pixmap, True
+
+        self.misses += 1
+        fallback = None
+        for (other_cut, version, _, other_aspect), other in self.pixmaps.items():
+            if other_cut is cut and version == cut.version and other_aspect == keep_aspect:
+                if fallback is None or other.width() > fallback.width():
+                    fallback = other
+        if fallback is None or not wait:
+            thumbnails.request(cut, cut.version, cut.panel, size, keep_aspect, self.ready.emit)
+        return fallback, False
+
+    def request_batch(self, cells, on_done):
+        # cells: [(cut, size, keep_aspect)]. on_done() is called once every one of them is in the cache, so a
+        # view can swap them all in with one repaint
+        missing = {(cut, cut.version, size, keep_aspect) for cut, size, keep_aspect in cells
+                   if (cut, cut.version) not in self.failed} - set(self.pixmaps)
+        if not missing:
+            on_done()
+            return
+        self.batches.append((missing, on_done))
+        for cut, version, size, keep_aspect in missing:
+            thumbnails.request(cut, version, cut.panel, size, keep_aspect, self.ready.emit)
+
+    def cancel_batches(self, on_done):
+        self.batches = [batch for batch in self.batches if batch[1] != on_done]
+
+    def on_ready(self, request, image):
+        cut, version = request[:2]
+        failed = image is None and cut.version == version
+        if failed:
+            # The cell keeps its placeholder until the panel is replaced
+            self.failed = {(other, other_version) for other, other_version in self.failed
+                           if other.version == other_version}
+            self.failed.add((cut, version))
+        elif image is not None and cut.version == version:
+            self.pixmaps[request] = pil_to_qpixmap(image)
+            while len(self.pixmaps) > self.capacity:
+                self.pixmaps.popitem(last=False)
+        # else the panel was replaced while it was being made
+
+        in_batch = False
+        for missing, on_done in list(self.batches):
+            if request in missing:
+                in_batch = True
+                missing.discard(request)
+                if not missing:
+                    self.batches.remove((missing, on_done))
+                    on_done()
+        if not in_batch and not failed:
+            self.updated.emit()
+
+    def carry_over(self, cut, version):
+        # The cut's panel was replaced by a sharper copy of the same picture (a finished import). The thumbnails
+        # made from the old one are kept for the new version instead of rendering them all again.
+        for request in [request for request in self.pixmaps if request[0] is cut and request[1] == version]:
+            self.pixmaps[(cut, cut.version) + request[2:]] = self.pixmaps.pop(request)
+        thumbnails.carry_over(cut, version, cut.version)
+
+    def clear(self):
+        self.pixmaps.clear()
+        self.failed.clear()
+
+
+class PanelImport:
+    __slots__ = ("index", "cut", "path", "version", "previewed", "batch")
+
+    def __init__(self, index, cut, path, batch=None):
+        self.index = index
+        self.cut = cut
+        self.path = path
+        self.version = cut.version  # The cut's version this import last saw, any other edit cancels it
+        self.previewed = False
+        self.batch = batch  # The ImportBatch of a bulk import
+
+
+class ImportBatch:
+    __slots__ = ("total", "done", "failures", "bulk")
+
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.failures = []  # [(path, message)]
+        self.bulk = None
+
+
+class PanelImports(QObject):
+    # Uploads being decoded on the import pool. The cell shows a placeholder until the preview comes in, the
+    # preview then stands in as the cut's panel until the full-resolution one replaces it. An import whose cut
+    # is edited meanwhile (drawn over, cleared, uploaded again, or a project loaded) is dropped.
+    preview_ready = Signal(object, object)
+    finished = Signal(object, object, object)
+    imported = Signal(object, object, object, object)
+    failed = Signal(str, str)
+    changed = Signal()
+    # Bulk imports report (done, total) as files come in, then (total, failures) once all of them have
+    batch_progress = Signal(int, int)
+    batch_finished = Signal(int, object)
+
+    def __init__(self, board, panel_thumbnails, parent=None):
+        super().__init__(parent)
+        self.board = board
+        self.panel_thumbnails = panel_thumbnails
+        self.pending = {}  # Cut -> PanelImport
+        self.batches = []
+        self.preview_ready.connect(self.on_preview_ready)
+        self.finished.connect(self.on_finished)
+        self.imported.connect(self.on_imported)
+
+    def start(self, index, path):
+        job = PanelImport(index, self.board.cuts[index], path)
+        self.pending[job.cut] = job
+        importer.submit(job, path, self.preview_ready.emit, self.finished.emit)
+        self.changed.emit()
+
+    def start_many(self, index, paths, workers=None):
+        # paths onto consecutive cuts from index, read on the bulk import pool. Each cell fills in as its file
+        # comes in, in whatever order they finish.
+        batch = ImportBatch(len(paths))
+        jobs = []
+        for offset, path in enumerate(paths):
+            job = PanelImport(index + offset, self.board.cuts[index + offset], path, batch)
+            self.pending[job.cut] = job
+            jobs.append((job, path))
+        batch.bulk = BulkImport(jobs, self.imported.emit, workers)
+        self.batches.append(batch)
+        batch.bulk.start()
+        self.changed.emit()
+        self.batch_progress.emit(0, batch.total)
+
+    def cancel(self):
+        # Drops every import in flight, for loading a project or closing the app
+        for batch in self.batches:
+            batch.bulk.cancel()
+        self.batches = []
+        self.pending.clear()
+        self.changed.emit()
+
+    def loading(self, cut):
+        job = self.pending.get(cut)
+        return job is not None and not job.previewed and job.version == cut.version
+
+    def current(self, job):
+        cut = job.cut
+        if self.pending.get(cut) is not job:
+            return False
+        if cut.version == job.version and job.index < len(self.board) and self.board.cuts[job.index] is cut:
+            return True
+        del self.pending[cut]
+        return False
+
+    def on_preview_ready(self, job, preview):
+        if not self.current(job):
+            return
+        job.previewed = True
+        self.board.set_panel(job.index, preview)
+        job.version = job.cut.version
 
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.setEditTriggers(QAbstractItemView.AllEditTriggers)
-        self.setHorizontalHeaderLabels(["#", "Storyboard", "Description", "Duration"])
-        self.verticalHeader().setVisible(False)
+    def on_finished(self, job, panel, error):
+        if not self.current(job):
+            return
+        del self.pending[job.cut]
+        if panel is None:
+            # Takes the placeholder down, a preview that did come in is kept
+            self.changed.emit()
+            self.failed.emit(job.path, error)
+            return
+        self.board.set_panel(job.index, panel)
+        if job.previewed:
+            self.panel_thumbnails.carry_over(job.cut, job.version)
 
-        for row in range(ROWS_PER_PAGE):
-            self.setItem(row, 0, self.create_number_item(self.start_number + row))
-            self._add_upload_button(row)
-            self._add_description_placeholder(row)
-            self._add_duration_widget(row)
+    def on_imported(self, job, panel, pyramid, error):
+        batch = job.batch
+        if batch not in self.batches:
+            return
+        batch.done += 1
+        if error is not None:
+            batch.failures.append((job.path, error))
+        if self.current(job):
+            del self.pending[job.cut]
+            if panel is not None:
+                self.board.set_panel(job.index, panel)
+                # The worker already made its thumbnail pyramid, the cell only has to cut its size from it
+                thumbnails.store(job.cut, job.cut.version, pyramid)
+            else:
+                self.changed.emit()
+        self.batch_progress.emit(batch.done, batch.total)
+        if batch.done == batch.total:
+            self.batches.remove(batch)
+            self.batch_finished.emit(batch.total, batch.failures)
 
-    def create_number_item(self, num):
-        item = QTableWidgetItem(str(num))
-        item.setFlags(Qt.ItemIsEnabled)
-        item.setTextAlignment(Qt.AlignCenter)
 
-        return item
+class StoryboardPageModel(QAbstractTableModel):
+    HEADERS = ["#", "Storyboard", "Description", "Duration"]
 
-    def update_geometry(self):
-        total_width = self.viewport().width() or DEFAULT_WIDTH  # fallback if zero
-        total_height = self.viewport().height() or 600
+    def __init__(self, board, page_index=0, parent=None):
+        super().__init__(parent)
+        self.board = board
+        self.page_index = page_index
+        self.board.subscribe(self.on_board_changed)
 
-        margin_width = 20
-        margin_height = 40
+    def set_page(self, page_index):
+        if page_index == self.page_index:
+            return
+        self.beginResetModel()
+        self.page_index = page_index
+        self.endResetModel()
 
-        total_width = max(0, total_width - margin_width)
-        total_height = max(0, total_height - margin_height)
+    def cut_index(self, row):
+        return self.board.cut_index(self.page_index, row)
 
-        row_height = total_height // ROWS_PER_PAGE
-        for row in range(ROWS_PER_PAGE):
-            self.setRowHeight(row, row_height)
+    @property
+    def mode(self):
+        return self.board.pages[self.page_index].mode
 
-        col1_width = int(total_width * 0.07)
-        storyboard_width = int((16 / 9) * row_height)
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.board.rows_per_page
 
-        if storyboard_width > total_width - col1_width:
-            storyboard_width = total_width - col1_width
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else COLS
 
-        rest_width = total_width - (col1_width + storyboard_width)
-        col3_width = int(rest_width * 0.7)
-        col4_width = rest_width - col3_width
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
 
-        self.setColumnWidth(0, col1_width)
-        self.setColumnWidth(1, storyboard_width)
-        self.setColumnWidth(2, col3_width)
-        self.setColumnWidth(3, col4_width)
+    def flags(self, index):
+        if index.column() in (2, 3):
+            return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+        return Qt.ItemIsEnabled
 
-        # Resize drawing widgets if any
-        for dw in self.draw_widgets:
-            if dw:
-                dw.setFixedSize(storyboard_width, row_height)
-
-    def create_fixed_size_button(self, text=None, pixmap=None, row=None):
-        btn = QPushButton()
-        btn.setProperty("row", row)
-        btn.setFlat(True)
-        btn.setCheckable(False)  # 🔹 Make sure it's not a toggle button
-        btn.setDown(False)     
-        btn.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-        if pixmap:
-            btn.setIcon(pixmap)
-            btn.setIconSize(pixmap.size())
-            btn.setText("")
-        else:
-            btn.setText("Upload Image")
-        btn.clicked.connect(self.handle_upload_clicked)
-
-        return btn
-
-    def _add_upload_button(self, row):
-        btn = self.create_fixed_size_button(text="Upload Image", row=row)
-        btn.setFixedSize(150, 85)
-        self.setCellWidget(row, 1, btn)
-
-    def _add_description_placeholder(self, row):
-        item = QTableWidgetItem(" ")
-        self.setItem(row, 2, item)
-
-    def _add_duration_widget(self, row):
-        dur_widget = DurationWidget(fps=self.fps)
-        dur_widget.on_value_changed(self.notify_parent_to_update_total)
-        cell_width = self.columnWidth(3) or 80
-        cell_height = self.rowHeight(row) or 50
-        dur_widget.setFixedSize(cell_width, cell_height)
-        self.setCellWidget(row, 3, dur_widget)
-        self.duration_widgets.append(dur_widget)
-
-    def notify_parent_to_update_total(self):
-        parent = self.parent()
-        while parent:
-            if hasattr(parent, "update_totals_for_page"):
-                parent.update_totals_for_page(self)
-                break
-            parent = parent.parent()
-
-    def update_page_total_duration(self):
-        total_seconds = 0
-        total_frames = 0
-        for dur_widget in self.duration_widgets:
-            s, f = dur_widget.get_duration()
-            total_seconds += s
-            total_frames += f
-
-        extra_seconds = total_frames // self.fps
-        total_seconds += extra_seconds
-        total_frames = total_frames % self.fps
-        return total_seconds, total_frames
-
-    def handle_upload_clicked(self):
-        button = self.sender()
-
-        if not button:
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        cut = self.cut_index(index.row())
+        column = index.column()
+        if column == 0:
+            if role == Qt.DisplayRole:
+                return str(self.board.number(cut))
+            if role == Qt.TextAlignmentRole:
+                return Qt.AlignCenter
+        elif column == 1:
+            if role == PANEL_ROLE:
+                return cut
+        elif column == 2:
+            if role in (Qt.DisplayRole, Qt.EditRole):
+                return self.board.description(cut)
+        elif column == 3:
+            if role == Qt.DisplayRole:
+                s, f = self.board.duration(cut)
+                return f"( {s} + {f} )"
+            if role == Qt.TextAlignmentRole:
+                return Qt.AlignCenter
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        cut = self.cut_index(index.row())
+        if index.column() == 2:
+            self.board.set_description(cut, value)
+            return True
+        if index.column() == 3:
+            self.board.set_duration(cut, *value)
+            return True
+        return False
+
+    def on_board_changed(self, index, field):
+        if index is None:
+            if field == "board":
+                self.beginResetModel()
+                self.page_index = min(self.page_index, max(0, self.board.page_count - 1))
+                self.endResetModel()
+            elif field == "mode":
+                self.dataChanged.emit(self.index(0, 1), self.index(self.rowCount() - 1, 1))
             return
+        page, row = self.board.locate(index)
+        column = {"panel": 1, "description": 2, "duration": 3}.get(field)
+        if page == self.page_index and column is not None:
+            self.dataChanged.emit(self.index(row, column), self.index(row, column))
 
-        button.setDown(False)  # 🔹 reset visual press
 
-        row = button.property("row")
-        if row is None:
+class PanelDelegate(QStyledItemDelegate):
+    def __init__(self, panel_thumbnails, panel_imports, parent=None):
+        super().__init__(parent)
+        self.panel_thumbnails = panel_thumbnails
+        self.panel_imports = panel_imports
+        # Set by the view while it is being resized, cells keep showing the thumbnails they have
+        self.deferred = False
+
+    def paint(self, painter, option, index):
+        model = index.model()
+        cut = model.board.cuts[index.data(PANEL_ROLE)]
+        rect = option.rect
+        if self.panel_imports.loading(cut):
+            painter.fillRect(rect, QColor(*THUMBNAIL_PLACEHOLDER))
+            painter.drawText(rect, Qt.AlignCenter, "Loading...")
             return
-
-        if self.mode != "upload":
-            # in draw mode, do nothing on upload button clicks
+        if cut.panel is None:
+            if model.mode == "draw":
+                painter.fillRect(rect, Qt.white)
+                return
+            button = QStyleOptionButton()
+            button.rect = QRect(rect.x(), rect.y(), min(UPLOAD_BUTTON_SIZE[0], rect.width()),
+                                min(UPLOAD_BUTTON_SIZE[1], rect.height()))
+            button.text = "Upload Image"
+            button.state = QStyle.State_Enabled
+            button.features = QStyleOptionButton.Flat
+            style = option.widget.style() if option.widget else QApplication.style()
+            style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
             return
 
-        file_path, _ = QFileDialog.getOpenFileName(self,
-                                                   "Select Storyboard Image",
-                                                   "",
-                                                   "Images (*.png *.jpg *.jpeg *.bmp *.gif)")
-        if not file_path:
+        # Upload mode letterboxes the panel, draw mode fills the cell like the canvas did
+        keep_aspect = model.mode == "upload"
+        pixmap, exact = self.panel_thumbnails.get(cut, (rect.width(), rect.height()), keep_aspect,
+                                                  wait=self.deferred)
+        if pixmap is None:
+            painter.fillRect(rect, QColor(*THUMBNAIL_PLACEHOLDER))
             return
+        if exact:
+            target = QRect(0, 0, pixmap.width(), pixmap.height())
+        elif keep_aspect:
+            target = QRect(0, 0, *fit_size(pixmap.width(), pixmap.height(), rect.width(), rect.height()))
+        else:
+            target = QRect(0, 0, rect.width(), rect.height())
+        target.moveCenter(rect.center())
+        # A stand-in from another size is stretched by the painter until the real one arrives, without
+        # filtering while the window is being dragged
+        painter.save()
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, not self.deferred)
+        painter.drawPixmap(target, pixmap)
+        painter.restore()
 
-        pil_img = Image.open(file_path).convert("RGBA")
-        self.uploaded_images[row] = pil_img
 
-        cell_width = self.columnWidth(1) or 150
-        cell_height = self.rowHeight(row) or 50
-        qt_pixmap = self.pil_to_qpixmap_scaled(pil_img, cell_width, cell_height)
+class DurationDelegate(QStyledItemDelegate):
+    def __init__(self, fps=DEFAULT_FPS, parent=None):
+        super().__init__(parent)
+        self.fps = fps
 
-        img_btn = self.create_fixed_size_button(pixmap=qt_pixmap, row=row)
-        img_btn.setFixedSize(cell_width, cell_height)
-        img_btn.setToolTip(file_path)
-        self.setCellWidget(row, 1, img_btn)
+    def createEditor(self, parent, option, index):
+        editor = DurationWidget(fps=self.fps, parent=parent)
+        editor.setAutoFillBackground(True)
+        editor.setFocusProxy(editor.seconds_edit)
+        # Written to the board as it is typed so the page total follows along
+        editor.on_value_changed(lambda: self.commitData.emit(editor))
+        return editor
 
-        # Clear draw widget if any
-        if self.draw_widgets[row]:
-            self.draw_widgets[row].deleteLater()
-            self.draw_widgets[row] = None
+    def setEditorData(self, editor, index):
+        model = index.model()
+        editor.set_duration(*model.board.duration(model.cut_index(index.row())))
 
-    def pil_to_qpixmap_scaled(self, pil_img, width, height):
-        img_ratio = pil_img.width / pil_img.height
-        target_ratio = width / height
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.get_duration())
 
-        if img_ratio > target_ratio:
-            new_width = width
-            new_height = int(width / img_ratio)
-        else:
-            new_height = height
-            new_width = int(height * img_ratio)
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
 
-        resized_img = pil_img.resize((new_width, new_height), Image.LANCZOS)
-        data = resized_img.tobytes("raw", "RGBA")
-        qimg = QImage(data, resized_img.width, resized_img.height, QImage.Format_RGBA8888)
-        return QPixmap.fromImage(qimg)
 
-    def switch_to_draw_mode(self):
-        self.mode = "draw"
-        # Replace storyboard column widgets with DrawingWidgets or blank if none
-        for row in range(ROWS_PER_PAGE):
-            if self.draw_widgets[row] is None:
-                dw = DrawingWidget(self.columnWidth(1), self.rowHeight(row))
-                self.draw_widgets[row] = dw
-            else:
-                dw = self.draw_widgets[row]
-                dw.setFixedSize(self.columnWidth(1), self.rowHeight(row))
-            self.setCellWidget(row, 1, self.draw_widgets[row])
-            self.uploaded_images[row] = None  # Clear uploaded images in draw mode
-
-    def switch_to_upload_mode(self):
-        self.mode = "upload"
-        # Replace storyboard column widgets with upload buttons or uploaded image buttons
-        for row in range(ROWS_PER_PAGE):
-            if self.draw_widgets[row]:
-                self.draw_widgets[row].deleteLater()
-                self.draw_widgets[row] = None
-            if self.uploaded_images[row]:
-                pil_img = self.uploaded_images[row]
-                cell_width = self.columnWidth(1) or 150
-                cell_height = self.rowHeight(row) or 50
-                qt_pixmap = self.pil_to_qpixmap_scaled(pil_img, cell_width, cell_height)
-                img_btn = self.create_fixed_size_button(pixmap=qt_pixmap, row=row)
-                img_btn.setFixedSize(cell_width, cell_height)
-                self.setCellWidget(row, 1, img_btn)
-            else:
-                self._add_upload_button(row)
+class StoryboardTable(QTableView):
+    # (first cut, paths) for files picked or dropped on a cell, the app puts them on the board
+    import_requested = Signal(int, object)
 
-    def mousePressEvent(self, event):
-        if self.mode != "draw":
-            super().mousePressEvent(event)
-            return
+    def __init__(self, board, panel_thumbnails, panel_imports, page_index=0, fps=DEFAULT_FPS, parent=None):
+        super().__init__(parent)
+        self.fps = fps
+        self.page_model = StoryboardPageModel(board, page_index, self)
+        self.setModel(self.page_model)
+        self.panel_thumbnails = panel_thumbnails
+        self.panel_imports = panel_imports
+        self.panel_delegate = PanelDelegate(panel_thumbnails, panel_imports, self)
+        panel_thumbnails.updated.connect(self.viewport().update)
+        panel_imports.changed.connect(self.viewport().update)
+
+        # Sizes follow the window live, new thumbnails are only asked for once resizing pauses
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(TABLE_RESIZE_DELAY_MS)
+        self.resize_timer.timeout.connect(self.refresh_thumbnails)
+        self.setItemDelegateForColumn(1, self.panel_delegate)
+        self.duration_delegate = DurationDelegate(fps, self)
+        self.setItemDelegateForColumn(3, self.duration_delegate)
+
+        # Brush settings the drawing dialog opens with
+        self.brush_color = COLOR_BLACK
+        self.brush_size = 5
+        self.eraser_mode = False
 
-        pos = event.position().toPoint() if hasattr(event, 'position') else event.pos()
-        index = self.indexAt(pos)
-        if not index.isValid():
-            super().mousePressEvent(event)
-            return
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setEditTriggers(QAbstractItemView.AllEditTriggers)
+        self.verticalHeader().setVisible(False)
+        # Image files and folders dropped on a row are imported from that row on
+        self.setAcceptDrops(True)
 
-        row = index.row()
-        col = index.column()
-        if col == 1 and 0 <= row < ROWS_PER_PAGE:
-            # Load full-res image from uploaded_images, fallback to blank canvas
-            current_img = self.uploaded_images[row]
-            if current_img is None:
-                current_img = Image.new("RGBA", (DEFAULT_WIDTH, DEFAULT_HEIGHT), COLOR_WHITE)
-
-            dlg = BigDrawingDialog(
-                pil_image=current_img,
-                brush_color=self.draw_widgets[row].brush_color if self.draw_widgets[row] else COLOR_BLACK,
-                brush_size=self.draw_widgets[row].brush_size if self.draw_widgets[row] else 5,
-                eraser_mode=self.draw_widgets[row].eraser_mode if self.draw_widgets[row] else False,
-                parent=self
-            )
-            if dlg.exec() == QDialog.Accepted:
-                new_img = dlg.get_image()
-
-                # Store full-res image for playback/export
-                self.uploaded_images[row] = new_img
-
-                # Create thumbnail sized to cell
-                thumb_width = self.columnWidth(1)
-                thumb_height = self.rowHeight(row)
-                thumbnail_img = new_img.resize((thumb_width, thumb_height), Image.LANCZOS)
-
-                # Update or create the draw widget thumbnail
-                if self.draw_widgets[row]:
-                    self.draw_widgets[row].image = thumbnail_img
-                    self.draw_widgets[row].draw = ImageDraw.Draw(self.draw_widgets[row].image)
-                    self.draw_widgets[row].update_pixmap()
-                else:
-                    dw = DrawingWidget(thumb_width, thumb_height)
-                    dw.image = thumbnail_img
-                    dw.draw = ImageDraw.Draw(dw.image)
-                    dw.update_pixmap()
-                    self.draw_widgets[row] = dw
-                    self.setCellWidget(row, 1, dw)
-
-                # Update draw widget image resized to widget size for thumbnail
-                if self.draw_widgets[row]:
-                    self.draw_widgets[row].image = new_img.resize(
-                        (self.draw_widgets[row].width(), self.draw_widgets[row].height()),
-                        Image.LANCZOS
-                    )
-                    self.draw_widgets[row].draw = ImageDraw.Draw(self.draw_widgets[row].image)
-                    self.draw_widgets[row].update_pixmap()
-                    # Store full res big image in uploaded_images for player
-                    self.uploaded_images[row] = new_img
-                else:
-                    # Justincase
-                    dw = DrawingWidget(self.columnWidth(1), self.rowHeight(row))
-                    dw.image = new_img.resize(
-                        (dw.width(), dw.height()), Image.LANCZOS)
-                    dw.draw = ImageDraw.Draw(dw.image)
-                    dw.update_pixmap()
-                    self.draw_widgets[row] = dw
-                    self.setCellWidget(row, 1, dw)
-                    self.uploaded_images[row] = new_img
-        else:
-            super().mousePressEvent(event)
+    @property
+    def board(self):
+        return self.page_model.board
 
-    def resizeEvent(self, event):
-        total_width = self.viewport().width()
-        total_height = self.viewport().height()
+    @property
+    def page_index(self):
+        return self.page_model.page_index
+
+    @property
+    def mode(self):
+        return self.page_model.mode
+
+    def cut_index(self, row):
+        return self.page_model.cut_index(row)
+
+    def set_page(self, page_index):
+        self.page_model.set_page(page_index)
+
+    def update_geometry(self):
+        total_width = self.viewport().width() or DEFAULT_WIDTH  # fallback if zero
+        total_height = self.viewport().height() or 600
 
         margin_width = 20
         margin_height = 40
@@ -558,14 +982,93 @@ class StoryboardTable(QTableWidget):
         self.setColumnWidth(2, col3_width)
         self.setColumnWidth(3, col4_width)
 
-        # Resize drawing widgets if any
-        for dw in self.draw_widgets:
-            if dw:
-                dw.setFixedSize(storyboard_width, row_height)
+    def upload_panel(self, row):
+        # Several files fill this cut and the ones after it
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Select Storyboard Images", "", IMAGE_FILTER)
+        if file_paths:
+            self.import_requested.emit(self.cut_index(row), file_paths)
+
+    def draw_panel(self, row):
+        # Load the full-res panel from the board, the dialog starts from a blank canvas if there is none
+        current_img = resolve_panel(self.board.panel(self.cut_index(row)))
+
+        dlg = BigDrawingDialog(
+            pil_image=current_img,
+            brush_color=self.brush_color,
+            brush_size=self.brush_size,
+            eraser_mode=self.eraser_mode,
+            parent=self
+        )
+        if dlg.exec() == QDialog.Accepted:
+            # Full-res drawing goes on the board for playback/export, the cell repaints from it
+            self.board.set_panel(self.cut_index(row), dlg.get_drawing())
+
+    def mousePressEvent(self, event):
+        pos = event.position().toPoint() if hasattr(event, 'position') else event.pos()
+        index = self.indexAt(pos)
+        if not index.isValid() or index.column() != 1 or event.button() != Qt.LeftButton:
+            super().mousePressEvent(event)
+            return
+
+        if self.mode == "draw":
+            self.draw_panel(index.row())
+        else:
+            self.upload_panel(index.row())
+
+    def dropped_paths(self, event):
+        mime = event.mimeData()
+        if not mime.hasUrls():
+            return []
+        return [url.toLocalFile() for url in mime.urls() if url.isLocalFile()]
+
+    def dragEnterEvent(self, event):
+        if self.dropped_paths(event):
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dragMoveEvent(self, event):
+        # Only over a row, the margin under the last one is not a cut
+        if self.dropped_paths(event) and self.indexAt(event.position().toPoint()).isValid():
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dropEvent(self, event):
+        paths = self.dropped_paths(event)
+        index = self.indexAt(event.position().toPoint())
+        if not paths or not index.isValid():
+            event.ignore()
+            return
+        event.acceptProposedAction()
+        self.import_requested.emit(self.cut_index(index.row()), paths)
 
+    def resizeEvent(self, event):
         super().resizeEvent(event)
+        self.update_geometry()
+        self.panel_thumbnails.cancel_batches(self.on_thumbnails_ready)
+        self.panel_delegate.deferred = True
+        self.resize_timer.start()
+
+    def refresh_thumbnails(self):
+        cells = []
+        keep_aspect = self.mode == "upload"
+        for row in range(self.page_model.rowCount()):
+            cut = self.board.cuts[self.cut_index(row)]
+            rect = self.visualRect(self.page_model.index(row, 1))
+            if cut.panel is not None and not rect.isEmpty():
+                cells.append((cut, (rect.width(), rect.height()), keep_aspect))
+        self.panel_thumbnails.request_batch(cells, self.on_thumbnails_ready)
+
+    def on_thumbnails_ready(self):
+        self.panel_delegate.deferred = False
+        self.viewport().update()
+
 
 class PlayerWindow(QDialog):
+    # (index, size, frame) for a finished cut frame, emitted from the prefetch worker and delivered on the GUI thread
+    frame_ready = Signal(int, object, object)
+
     def __init__(self, frames, durations, numbers, descriptions, fps=DEFAULT_FPS, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Storyboard Playback")
@@ -574,233 +1077,280 @@ class PlayerWindow(QDialog):
         self.numbers = numbers
         self.durations = durations
         self.descriptions = descriptions
-        self.current_index = 0
-        self.elapsed_ms = 0
+        self.current_index = None
+        self.cut_frame = 0
+        self.timeline = Timeline(durations, fps)
+        self.clock = PlaybackClock(fps)
 
         self.resize(960, 540)
 
-        self.label = QLabel()
-        self.label.setAlignment(Qt.AlignCenter)
+        self.view = PlaybackView()
         layout = QVBoxLayout(self)
-        layout.addWidget(self.label)
-
+        layout.addWidget(self.view)
+
+        # Transport controls, each one is a seek on the timeline
+        self.scrubber = QSlider(Qt.Horizontal)
+        self.scrubber.setRange(0, max(0, self.timeline.total_frames - 1))
+        self.scrubber.setFocusPolicy(Qt.NoFocus)
+        self.scrubber.valueChanged.connect(self.seek)
+        self.scrubber.sliderPressed.connect(self.on_scrub_started)
+        self.scrubber.sliderReleased.connect(self.on_scrub_finished)
+        layout.addWidget(self.scrubber)
+        self.resume_after_scrub = False
+
+        controls = QHBoxLayout()
+        self.prev_cut_btn = QPushButton("|<")
+        self.prev_cut_btn.setToolTip("Previous cut (Page Up)")
+        self.prev_cut_btn.clicked.connect(self.previous_cut)
+        self.step_back_btn = QPushButton("<")
+        self.step_back_btn.setToolTip("Back one frame (Left)")
+        self.step_back_btn.clicked.connect(lambda: self.step_frames(-1))
+        self.play_btn = QPushButton("Pause")
+        self.play_btn.setToolTip("Play / pause (Space)")
+        self.play_btn.clicked.connect(self.toggle_playback)
+        self.step_forward_btn = QPushButton(">")
+        self.step_forward_btn.setToolTip("Forward one frame (Right)")
+        self.step_forward_btn.clicked.connect(lambda: self.step_frames(1))
+        self.next_cut_btn = QPushButton(">|")
+        self.next_cut_btn.setToolTip("Next cut (Page Down)")
+        self.next_cut_btn.clicked.connect(self.next_cut)
+
+        self.loop_checkbox = QCheckBox("Loop")
+        self.loop_checkbox.toggled.connect(self.update_loop_label)
+        self.loop_in_btn = QPushButton("Set In")
+        self.loop_in_btn.setToolTip("Start the loop range here (I)")
+        self.loop_in_btn.clicked.connect(self.set_loop_in)
+        self.loop_out_btn = QPushButton("Set Out")
+        self.loop_out_btn.setToolTip("End the loop range after this frame (O)")
+        self.loop_out_btn.clicked.connect(self.set_loop_out)
+        self.loop_clear_btn = QPushButton("Clear Range")
+        self.loop_clear_btn.clicked.connect(self.clear_loop_range)
+        self.loop_label = QLabel()
+
+        for widget in (self.prev_cut_btn, self.step_back_btn, self.play_btn, self.step_forward_btn,
+                       self.next_cut_btn, self.loop_checkbox, self.loop_in_btn, self.loop_out_btn,
+                       self.loop_clear_btn):
+            widget.setFocusPolicy(Qt.NoFocus)
+            controls.addWidget(widget)
+        controls.addWidget(self.loop_label)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        QShortcut(QKeySequence(Qt.Key_Space), self, self.toggle_playback)
+        QShortcut(QKeySequence(Qt.Key_Left), self, lambda: self.step_frames(-1))
+        QShortcut(QKeySequence(Qt.Key_Right), self, lambda: self.step_frames(1))
+        QShortcut(QKeySequence(Qt.Key_PageUp), self, self.previous_cut)
+        QShortcut(QKeySequence(Qt.Key_PageDown), self, self.next_cut)
+        QShortcut(QKeySequence(Qt.Key_I), self, self.set_loop_in)
+        QShortcut(QKeySequence(Qt.Key_O), self, self.set_loop_out)
+
+        self.loop_in = None
+        self.loop_out = None
+        self.update_loop_label()
+
+        # Sample the clock twice per frame so no frame is shown late by more than half a frame
         self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(max(1, int(1000 / fps / PLAYBACK_TICKS_PER_FRAME)))
         self.timer.timeout.connect(self.update_frame)
 
         self.current_image = None
+        self.timecode_text = None
+        self.frame_size = None
+        self.frame_prefetcher = FramePrefetcher(self.render_cut_frame, self.frame_ready.emit)
+        # Queued even when the frame was already done, so it is never handled in the middle of show_frame
+        self.frame_ready.connect(self.on_frame_ready, Qt.QueuedConnection)
+
+        # Wait for the user to stop dragging before re-rendering at the new size
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(PLAYBACK_RESIZE_DELAY_MS)
+        self.resize_timer.timeout.connect(self.refresh_frame)
 
         self.start_playback()
 
+    def render_cut_frame(self, index, size):
+        # Runs on the prefetch worker thread
+        try:
+            return compose_cut_frame(self.frames[index], size, self.numbers[index], self.descriptions[index])
+        except Exception as e:
+            # A panel that cannot be decoded plays as a blank frame with its cut number
+            log.warning("playback frame for cut %s failed: %s", self.numbers[index], e)
+            return compose_cut_frame(None, size, self.numbers[index], self.descriptions[index])
+
     def start_playback(self):
-        self.current_index = 0
-        self.elapsed_ms = 0
-        self.show_frame(self.current_index)
-        self.timer.start(40)
+        self.current_index = None
+        self.play(0)
+
+    def play(self, frame=None):
+        if frame is None:
+            frame = self.clock.frame()
+            if frame >= self.timeline.total_frames - 1 and self.loop_range() is None:
+                frame = 0  # at the end, play from the top again
+        self.clock.start(frame)
+        self.play_btn.setText("Pause")
+        self.update_frame()
+        self.timer.start()
+
+    def pause(self):
+        self.timer.stop()
+        self.clock.stop()
+        self.play_btn.setText("Play")
+
+    def toggle_playback(self):
+        if self.clock.running:
+            self.pause()
+        else:
+            self.play()
 
     def update_frame(self):
-        if self.current_index >= len(self.frames):
-            self.timer.stop()
-            return
-
-        s, f = self.durations[self.current_index]
-        total_ms = int((s + f / self.fps) * 1000)
-
-        if total_ms <= 0:
-            self.current_index += 1
-            self.elapsed_ms = 0
-            if self.current_index < len(self.frames):
-                self.show_frame(self.current_index)
+        frame, finished = self.clock.tick(self.timeline.total_frames, self.loop_range())
+        if finished:
+            # Hold the last frame of the last cut
+            self.pause()
+        self.show_position(frame)
+
+    def show_position(self, frame):
+        index, self.cut_frame = self.timeline.locate(frame)
+        if index != self.current_index:
+            # A late tick can jump straight past short cuts, they are simply not shown
+            self.current_index = index
+            self.show_frame(index)
+        else:
+            self.update_timecode_display()
+        self.scrubber.blockSignals(True)
+        self.scrubber.setValue(frame)
+        self.scrubber.blockSignals(False)
+
+    def seek(self, frame):
+        frame = min(max(0, frame), max(0, self.timeline.total_frames - 1))
+        self.clock.seek(frame)
+        self.show_position(frame)
+
+    def step_frames(self, count):
+        self.pause()
+        self.seek(self.clock.frame() + count)
+
+    def previous_cut(self):
+        start = self.timeline.cut_start(self.current_index)
+        if self.cut_frame == 0 and self.current_index > 0:
+            start = self.timeline.cut_start(self.current_index - 1)
+        self.seek(start)
+
+    def next_cut(self):
+        if self.current_index + 1 < len(self.timeline):
+            self.seek(self.timeline.cut_start(self.current_index + 1))
+
+    def on_scrub_started(self):
+        self.resume_after_scrub = self.clock.running
+        self.pause()
+
+    def on_scrub_finished(self):
+        if self.current_index is not None:
+            # Queue the cuts after where the scrub stopped
+            self.show_frame(self.current_index)
+        if self.resume_after_scrub:
+            self.play()
+
+    def loop_range(self):
+        # (first frame, end frame) to loop over, or None when not looping
+        if not self.loop_checkbox.isChecked():
+            return None
+        start = self.loop_in if self.loop_in is not None else 0
+        end = self.loop_out if self.loop_out is not None else self.timeline.total_frames
+        if end <= start:
+            return None
+        return start, end
+
+    def set_loop_in(self):
+        self.loop_in = self.clock.frame()
+        if self.loop_out is not None and self.loop_out <= self.loop_in:
+            self.loop_out = None
+        self.update_loop_label()
+
+    def set_loop_out(self):
+        self.loop_out = self.clock.frame() + 1
+        if self.loop_in is not None and self.loop_in >= self.loop_out:
+            self.loop_in = None
+        self.update_loop_label()
+
+    def clear_loop_range(self):
+        self.loop_in = None
+        self.loop_out = None
+        self.update_loop_label()
+
+    def describe_frame(self, frame):
+        index, cut_frame = self.timeline.locate(frame)
+        return f"#{self.numbers[index]} {format_timecode(cut_frame, self.fps)}"
+
+    def update_loop_label(self):
+        if self.loop_in is None and self.loop_out is None:
+            self.loop_label.setText("Range: whole board")
             return
-
-        self.elapsed_ms += 40
-
-        if self.elapsed_ms >= total_ms:
-            self.current_index += 1
-            self.elapsed_ms = 0
-            if self.current_index < len(self.frames):
-                self.show_frame(self.current_index)
-            else:
-                self.timer.stop()
-                return
-
-        self.update_timecode_display()
+        start = self.describe_frame(self.loop_in or 0)
+        end = self.describe_frame((self.loop_out or self.timeline.total_frames) - 1)
+        self.loop_label.setText(f"Range: {start} to {end}")
 
     def show_frame(self, index):
-        pil_image = self.frames[index]
-        target_w, target_h = self.width(), self.height()
-        target_ratio = 16 / 9
-        new_h = target_h
-        new_w = int(new_h * target_ratio)
-        if new_w > target_w:
-            new_w = target_w
-            new_h = int(new_w / target_ratio)
-
-        img_resized = pil_image.resize((new_w, new_h), Image.LANCZOS).convert("RGBA")
-
-        self.current_image = img_resized
-        self.elapsed_ms = 0
+        # The composited cut frame comes from the prefetcher, which also starts on the cuts that play next. A frame
+        # that is not rendered yet arrives through frame_ready, the previous one stays up until then.
+        self.frame_size = (self.view.width(), self.view.height())
+        upcoming = ()
+        if not self.scrubber.isSliderDown():
+            # While scrubbing the worker only renders what is under the play head
+            upcoming = self.timeline.upcoming(index, PLAYBACK_LOOKAHEAD, self.loop_range())
+        frame = self.frame_prefetcher.get(index, self.frame_size, upcoming)
+        if frame is not None:
+            self.set_cut_image(frame)
+
+    def on_frame_ready(self, index, size, frame):
+        # Frames for cuts the play head has already left are only kept in the prefetcher's cache
+        if index == self.current_index and size == self.frame_size and frame is not self.current_image:
+            self.set_cut_image(frame)
+
+    def set_cut_image(self, frame):
+        self.current_image = frame
+        self.view.set_frame(frame)
         self.update_timecode_display(force=True)
 
-        bg = Image.new("RGBA", (target_w, target_h), COLOR_BLACK)
-
-        if pil_image:
-            img_ratio = pil_image.width / pil_image.height
-            if img_ratio > target_ratio:
-                new_w = target_w
-                new_h = int(target_w / img_ratio)
-            else:
-                new_h = target_h
-                new_w = int(target_h * img_ratio)
-
-            resized_img = pil_image.resize((new_w, new_h), Image.LANCZOS)
-            x_offset = (target_w - new_w) // 2
-            y_offset = (target_h - new_h) // 2
-            bg.paste(resized_img, (x_offset, y_offset))
-        else:
-            # blank black frame
-            pass
-
-        # Draw storyboard number on top-left
-        draw = ImageDraw.Draw(bg)
-        font_size = max(10, target_h // 20)
-        try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except IOError:
-            font = ImageFont.load_default()
-
-        text = f"Cut no. {self.numbers[index]}"
-        margin = 10
-        text_pos = (margin, margin)
-        shadow_color = COLOR_BLACK
-        text_color = COLOR_WHITE
-
-        for offset in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-            pos = (text_pos[0] + offset[0], text_pos[1] + offset[1])
-            draw.text(pos, text, font=font, fill=shadow_color)
-
-        draw.text(text_pos, text, font=font, fill=text_color)
+    def refresh_frame(self):
+        # Re-render the cut on screen at the new window size, playback position is kept by the clock
+        if self.current_index is None or (self.view.width(), self.view.height()) == self.frame_size:
+            return
+        self.show_frame(self.current_index)
 
-        self.current_image = bg
-        self.elapsed_ms = 0  # reset timecode count on new frame
-        self.update_timecode_display(force=True)
-    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.frame_size is not None and (self.view.width(), self.view.height()) != self.frame_size:
+            # Frames rendered for the old size are useless now
+            self.frame_prefetcher.invalidate()
+            self.resize_timer.start()
+
+    def done(self, result):
+        # The close button, Escape and reject() all come through here, closeEvent alone misses Escape
+        self.timer.stop()
+        self.resize_timer.stop()
+        self.frame_prefetcher.shutdown()
+        super().done(result)
 
     def update_timecode_display(self, force=False):
         if not self.current_image:
             return
 
-        img = self.current_image.copy()
-        draw = ImageDraw.Draw(img)
-
-        font_size = max(24, img.height // 20)
-        try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except IOError:
-            font = ImageFont.load_default()
-
-        s, f = self.durations[self.current_index]
-        total_ms = int((s + f / self.fps) * 1000)
-        elapsed_ms = min(self.elapsed_ms, total_ms)
-        elapsed_sec = elapsed_ms // 1000
-        elapsed_frame = int((elapsed_ms % 1000) / (1000 / self.fps))
-
-        timecode_text = f"{elapsed_sec:02d}s + {elapsed_frame:02d}f"
-        margin = img.height // 30
-        x = margin
-        y = img.height - margin - font_size
-
-        shadow_color = COLOR_BLACK
-        text_color = COLOR_WHITE
-
-        for offset in [(-2, -2), (-2, 2), (2, -2), (2, 2)]:
-            draw.text((x + offset[0], y + offset[1]), timecode_text, font=font, fill=shadow_color)
-        draw.text((x, y), timecode_text, font=font, fill=text_color)
-
-        # Draw description bottom-left aligned left
-        description = self.descriptions[self.current_index]
-        if description:
-            desc_font_size = max(18, img.height // 30)
-            try:
-                desc_font = ImageFont.truetype("arial.ttf", desc_font_size)
-            except IOError:
-                desc_font = ImageFont.load_default()
-
-            desc_margin = 15
-            # Get bounding box: (left, top, right, bottom)
-            bbox = desc_font.getbbox(description)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-
-            desc_pos = (img.width - desc_margin - text_width, img.height - desc_margin - text_height)
-
-                # Draw shadow for readability
-            for offset in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-                pos = (desc_pos[0] + offset[0], desc_pos[1] + offset[1])
-                draw.text(pos, description, font=desc_font, fill=shadow_color)
-
-             # Draw main text
-            draw.text(desc_pos, description, font=desc_font, fill=text_color)
-            data = img.tobytes("raw", "RGBA")
-            qimg = QImage(data, img.width, img.height, QImage.Format_RGBA8888)
-            pixmap = QPixmap.fromImage(qimg)
-            self.label.setPixmap(pixmap.scaled(self.label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
-
-    def render_frame_for_export(self, index):
-        pil_image = self.frames[index]
-        target_w, target_h = 1920, 1080  # fixed export size
-        target_ratio = 16 / 9
-
-        bg = Image.new("RGBA", (target_w, target_h), COLOR_BLACK)
-
-        if pil_image:
-            img_ratio = pil_image.width / pil_image.height
-            if img_ratio > target_ratio:
-                new_w = target_w
-                new_h = int(target_w / img_ratio)
-            else:
-                new_h = target_h
-                new_w = int(target_h * img_ratio)
-            resized_img = pil_image.resize((new_w, new_h), Image.LANCZOS)
-            x_offset = (target_w - new_w) // 2
-            y_offset = (target_h - new_h) // 2
-            bg.paste(resized_img, (x_offset, y_offset))
+        timecode_text = format_timecode(self.cut_frame, self.fps)
+        if timecode_text == self.timecode_text and not force:
+            return
+        self.timecode_text = timecode_text
 
-        draw = ImageDraw.Draw(bg)
+        height = self.current_image.height
+        font_size = max(24, height // 20)
+        font = get_font(font_size)
 
-        # Draw storyboard number
-        font_size = max(24, target_h // 20)
-        try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except IOError:
-            font = ImageFont.load_default()
-
-        text = f"#{self.numbers[index]}"
-        margin = 10
-        text_pos = (margin, margin)
-        shadow_color = COLOR_BLACK
-        text_color = COLOR_WHITE
-
-        for offset in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-            pos = (text_pos[0] + offset[0], text_pos[1] + offset[1])
-            draw.text(pos, text, font=font, fill=shadow_color)
-        draw.text(text_pos, text, font=font, fill=text_color)
-
-        # Draw description bottom-right
-        description = self.descriptions[index] if hasattr(self, "descriptions") else ""
-        if description:
-            desc_font_size = max(18, target_h // 30)
-            try:
-                desc_font = ImageFont.truetype("arial.ttf", desc_font_size)
-            except IOError:
-                desc_font = ImageFont.load_default()
-            desc_w, desc_h = draw.textsize(description, font=desc_font)
-            desc_pos = (target_w - desc_w - 15, target_h - desc_h - 15)
-            for offset in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-                pos = (desc_pos[0] + offset[0], desc_pos[1] + offset[1])
-                draw.text(pos, description, font=desc_font, fill=shadow_color)
-            draw.text(desc_pos, description, font=desc_font, fill=text_color)
-
-        return bg
+        margin = height // 30
+        x = margin
+        y = height - margin - font_size
+        layer, (dx, dy) = text_sprites.glyph_layer(timecode_text, font, 2)
+        self.view.set_overlay("timecode", layer, (x + dx, y + dy))
 
 class StoryboardPlanner(QMainWindow):
     def __init__(self):
@@ -828,9 +1378,29 @@ class StoryboardPlanner(QMainWindow):
         load_action.triggered.connect(self.load_project)
         file_menu.addAction(load_action)
 
-        export_video_action = QAction("i wouldve made export mp4 but idk how", self)
+        recover_action = QAction("Recover Autosave From Last Session", self)
+        recover_action.triggered.connect(self.recover_autosave)
+        file_menu.addAction(recover_action)
+
+        import_images_action = QAction("Import Images", self)
+        import_images_action.triggered.connect(self.import_images_dialog)
+        file_menu.addAction(import_images_action)
+
+        import_folder_action = QAction("Import Folder", self)
+        import_folder_action.triggered.connect(self.import_folder_dialog)
+        file_menu.addAction(import_folder_action)
+
+        export_video_action = QAction("Export Animatic (MP4/WebM)", self)
+        export_video_action.triggered.connect(self.export_video)
         file_menu.addAction(export_video_action)
 
+        self.project_actions = [save_action, load_action, recover_action, export_video_action]
+        self.project_task = None
+        self.project_progress = QProgressBar()
+        self.project_progress.setMaximumWidth(200)
+        self.project_progress.hide()
+        self.statusBar().addPermanentWidget(self.project_progress)
+
         export_spread_action = QAction("Export Spread (JPG/PNG)", self)
         export_spread_action.triggered.connect(self.export_spread)
         file_menu.addAction(export_spread_action)
@@ -879,18 +1449,27 @@ class StoryboardPlanner(QMainWindow):
         self.play_btn.clicked.connect(self.play_storyboard)
         self.pagination_layout.addWidget(self.play_btn)
 
+        self.add_spread_btn = QPushButton("Add Spread")
+        self.add_spread_btn.clicked.connect(self.add_spread)
+        self.pagination_layout.addWidget(self.add_spread_btn)
+
+        self.board = Board(DEFAULT_PAGE_COUNT, ROWS_PER_PAGE)
+        self.board.subscribe(self.on_board_changed)
+        self.title_edit.textChanged.connect(self.board.set_title)
+
+        # One view per side of the spread, update_view() points them at the pages on screen
+        self.panel_thumbnails = PanelThumbnails(parent=self)
+        self.panel_imports = PanelImports(self.board, self.panel_thumbnails, parent=self)
+        self.panel_imports.failed.connect(self.on_import_failed)
+        self.panel_imports.batch_progress.connect(self.on_import_progress)
+        self.panel_imports.batch_finished.connect(self.on_import_batch_finished)
         self.pages = []
         self.page_containers = []
         self.total_labels = []
 
-        
-
-        for page in self.pages:
-           page.update_geometry()
-
-        for i in range(TOTAL_PAGES):
-            start_num = i * ROWS_PER_PAGE + 1
-            page = StoryboardTable(page_number=i + 1, fps=DEFAULT_FPS, start_number=start_num)
+        for side in range(2):
+            page = StoryboardTable(self.board, self.panel_thumbnails, self.panel_imports, side, fps=DEFAULT_FPS)
+            page.import_requested.connect(self.import_images)
             total_label = QLabel("Total Duration: 0 s + 0 f")
             total_label.setAlignment(Qt.AlignRight)
             total_label.setStyleSheet("font-weight: bold; padding-right: 5px;")
@@ -901,6 +1480,7 @@ class StoryboardPlanner(QMainWindow):
             vlayout.setSpacing(2)
             vlayout.addWidget(page)
             vlayout.addWidget(total_label)
+            self.spread_layout.addWidget(container, 1)
 
             self.pages.append(page)
             self.total_labels.append(total_label)
@@ -913,16 +1493,17 @@ class StoryboardPlanner(QMainWindow):
         # Set default mode for all pages
         self.on_mode_changed(self.mode_combo.currentIndex())
 
+        self.setup_autosave()
+
 
     def on_mode_changed(self, index):
-        mode_text = self.mode_combo.currentText()
-        if "Draw" in mode_text:
-            for page in self.pages:
-                page.switch_to_draw_mode()
-        else:
-            for page in self.pages:
-                page.switch_to_upload_mode()
-        self.update_view()
+        mode = "draw" if "Draw" in self.mode_combo.currentText() else "upload"
+        for page_index in range(self.board.page_count):
+            self.board.set_page_mode(page_index, mode)
+            if mode == "draw":
+                # Clear uploaded images in draw mode
+                for cut in range(*self.board.page_range(page_index)):
+                    self.board.set_panel(cut, None)
 
     def open_color_picker(self):
         color = QColorDialog.getColor()
@@ -931,61 +1512,113 @@ class StoryboardPlanner(QMainWindow):
 
         rgba = (color.red(), color.green(), color.blue(), 255)
         self.current_brush_color = rgba
-        # Update all drawing widgets brush color
         for page in self.pages:
-            for dw in page.draw_widgets:
-                if dw:
-                    dw.set_brush_color(rgba)
+            page.brush_color = rgba
 
     def brush_size_changed(self, value):
         self.current_brush_size = value
         for page in self.pages:
-            for dw in page.draw_widgets:
-                if dw:
-                    dw.brush_size = value
+            page.brush_size = value
 
     def eraser_toggled(self, checked):
         self.eraser_mode = checked
         for page in self.pages:
-            for dw in page.draw_widgets:
-                if dw:
-                    dw.set_eraser_mode(checked)
+            page.eraser_mode = checked
 
-    def update_view(self):
-        for i in reversed(range(self.spread_layout.count())):
-            item = self.spread_layout.takeAt(i)
-            widget = item.widget()
-            if widget:
-                widget.hide()
+    def spread_count(self):
+        return (self.board.page_count + 1) // 2
 
+    def update_view(self):
+        total_spreads = self.spread_count()
+        self.current_spread_index = max(0, min(self.current_spread_index, total_spreads - 1))
         left_idx = self.current_spread_index * 2
-        right_idx = left_idx + 1
-
-        def show_page(idx):
-            if idx < 0 or idx >= len(self.page_containers):
-                return
-            container = self.page_containers[idx]
-            s, f = self.pages[idx].update_page_total_duration()
-            self.total_labels[idx].setText(f"Total Duration: {s} s + {f} f")
-            container.show()
-            self.spread_layout.addWidget(container, 1)
 
-        show_page(left_idx)
-        show_page(right_idx)
+        for side, container in enumerate(self.page_containers):
+            page_index = left_idx + side
+            if page_index < self.board.page_count:
+                self.pages[side].set_page(page_index)
+                self.update_totals_for_page(page_index)
+                container.show()
+            else:
+                container.hide()
 
-        total_spreads = (len(self.pages) + 1) // 2
         self.page_label.setText(f"Spread {self.current_spread_index + 1} / {total_spreads}")
 
         self.prev_btn.setEnabled(self.current_spread_index > 0)
         self.next_btn.setEnabled(self.current_spread_index < total_spreads - 1)
 
-    def update_totals_for_page(self, page):
-        try:
-            idx = self.pages.index(page)
-        except ValueError:
+    def on_board_changed(self, index, field):
+        if index is None:
+            if field in ("board", "pages"):
+                self.update_view()
+        elif field == "duration":
+            self.update_totals_for_page(self.board.locate(index)[0])
+
+    def import_images_dialog(self):
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Import Images", "", IMAGE_FILTER)
+        if file_paths:
+            # From the top of the spread on screen
+            self.import_images(self.pages[0].cut_index(0), file_paths)
+
+    def import_folder_dialog(self):
+        directory = QFileDialog.getExistingDirectory(self, "Import Folder")
+        if directory:
+            self.import_images(self.pages[0].cut_index(0), [directory])
+
+    def import_images(self, index, paths):
+        # Image files, and the images inside folders, onto consecutive cuts starting at index
+        file_paths = []
+        for path in paths:
+            if os.path.isdir(path):
+                file_paths.extend(list_images(path))
+            elif is_image_file(path):
+                file_paths.append(path)
+        if not file_paths:
+            QMessageBox.warning(self, "Import Images", "No images to import.")
+            return
+
+        overflow = index + len(file_paths) - len(self.board)
+        if overflow > 0:
+            page_count = -(-overflow // self.board.rows_per_page)
+            answer = QMessageBox.question(
+                self, "Import Images",
+                f"{len(file_paths)} images from cut {self.board.number(index)} run past the end of the board.\n"
+                f"Add {page_count} page(s) for the rest? No only imports the images that fit.",
+                QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel, QMessageBox.Yes)
+            if answer == QMessageBox.Cancel:
+                return
+            if answer == QMessageBox.Yes:
+                self.board.append_pages(page_count)
+            else:
+                file_paths = file_paths[:len(self.board) - index]
+
+        if len(file_paths) == 1:
+            # Decoded on the import pool, the cell fills in as the preview and then the full image arrive
+            self.panel_imports.start(index, file_paths[0])
+        else:
+            self.panel_imports.start_many(index, file_paths)
+
+    def on_import_failed(self, path, message):
+        QMessageBox.warning(self, "Upload Image", f"Could not open {path}:\n{message}")
+
+    def on_import_progress(self, done, total):
+        self.statusBar().showMessage(f"Importing images: {done} / {total}")
+
+    def on_import_batch_finished(self, total, failures):
+        self.statusBar().showMessage(f"Imported {total - len(failures)} of {total} images", 5000)
+        if failures:
+            lines = [f"{os.path.basename(path)}: {message}" for path, message in failures[:10]]
+            if len(failures) > 10:
+                lines.append(f"... and {len(failures) - 10} more")
+            QMessageBox.warning(self, "Import Images", "Some images could not be imported:\n" + "\n".join(lines))
+
+    def update_totals_for_page(self, page_index):
+        # Only the pages on screen have a label
+        side = page_index - self.current_spread_index * 2
+        if not 0 <= side < len(self.total_labels):
             return
-        s, f = page.update_page_total_duration()
-        self.total_labels[idx].setText(f"Total Duration: {s} s + {f} f")
+        s, f = self.board.page_duration(page_index, DEFAULT_FPS)
+        self.total_labels[side].setText(f"Total Duration: {s} s + {f} f")
 
     def go_previous(self):
         if self.current_spread_index > 0:
@@ -993,228 +1626,190 @@ class StoryboardPlanner(QMainWindow):
             self.update_view()
 
     def go_next(self):
-        total_spreads = (len(self.pages) + 1) // 2
-        if self.current_spread_index < total_spreads - 1:
+        if self.current_spread_index < self.spread_count() - 1:
             self.current_spread_index += 1
             self.update_view()
 
-    def play_storyboard(self):
-        frames = []
-        durations = []
-        numbers = []
-        descriptions = []
-
-        for page in self.pages:
-            for i in range(ROWS_PER_PAGE):
-                s, f = page.duration_widgets[i].get_duration()
-
-                # Force a minimum duration if the user hasn't set one
-                if s == 0 and f == 0:
-                    continue 
-
-                img = page.uploaded_images[i]
-                if img is None:
-                    img = Image.new("RGBA", (DEFAULT_WIDTH, DEFAULT_HEIGHT), COLOR_WHITE)
-
-                frames.append(img)
-                durations.append((s, f))
-                storyboard_number = page.start_number + i
-                numbers.append(storyboard_number)
+    def add_spread(self):
+        # New pages take the mode of the last one
+        self.board.append_pages(2)
+        self.current_spread_index = self.spread_count() - 1
+        self.update_view()
 
-                # Always add description, even if it's empty
-                desc_item = page.item(i, 2)
-                descriptions.append(desc_item.text() if desc_item else "")
+    def collect_cuts(self):
+        # (frames, durations, numbers, descriptions) for every cut that has a duration.
+        # Frames are rendered on a worker thread while the board stays editable
+        return self.board.export_cuts(snapshot=snapshot_panel)
 
+    def play_storyboard(self):
+        frames, durations, numbers, descriptions = self.collect_cuts()
         if not frames:
             return
 
         self.player = PlayerWindow(frames, durations, numbers, descriptions, fps=DEFAULT_FPS)
         self.player.show()
 
-    def save_project(self):
-        filename, _ = QFileDialog.getSaveFileName(self, "Save Project", "", "Storyboard Project (*.json)")
+    def export_video(self):
+        frames, durations, numbers, descriptions = self.collect_cuts()
+        if not frames:
+            QMessageBox.information(self, "Export Animatic", "No cuts have a duration yet.")
+            return
+
+        filename, selected_filter = QFileDialog.getSaveFileName(
+            self, "Export Animatic", "", "MP4 Video (*.mp4);;WebM Video (*.webm)"
+        )
         if not filename:
             return
-        if not filename.endswith(".json"):
-            filename += ".json"
+        if not filename.lower().endswith(VIDEO_EXTENSIONS):
+            filename += ".webm" if "webm" in selected_filter.lower() else ".mp4"
 
-        data = {
-            "title": self.title_edit.text(),
-            "pages": []
-        }
+        self.start_project_task("Exporting", self.on_video_exported, "Export Animatic",
+                                export_animatic, filename, frames, durations, numbers, descriptions, DEFAULT_FPS)
 
-        for page in self.pages:
-            page_data = {
-                "start_number": page.start_number,
-                "mode": page.mode,
-                "rows": []
-            }
-            for row in range(ROWS_PER_PAGE):
-                s, f = page.duration_widgets[row].get_duration()
-                description = page.item(row, 2).text() if page.item(row, 2) else ""
-                img_data = None
-                if page.uploaded_images[row]:
-                    with io.BytesIO() as output:
-                        page.uploaded_images[row].save(output, format="PNG")
-                        img_bytes = output.getvalue()
-                    img_data = img_bytes.hex()
-                row_data = {
-                    "duration": (s, f),
-                    "description": description,
-                    "image_data": img_data,
-                    "mode": page.mode,
-                }
-                page_data["rows"].append(row_data)
-            data["pages"].append(page_data)
+    def on_video_exported(self, path):
+        if os.path.isdir(path):
+            QMessageBox.information(self, "Export Animatic",
+                                    f"ffmpeg was not found, so the animatic was saved as PNG frames in:\n{path}")
+        else:
+            QMessageBox.information(self, "Export Animatic", f"Animatic exported to:\n{path}")
+
+    def setup_autosave(self):
+        autosave_dir = os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation), "autosave")
+        os.makedirs(autosave_dir, exist_ok=True)
+        self.previous_autosave_path = os.path.join(autosave_dir, "previous_session")
+        rotate_autosave(os.path.join(autosave_dir, "board"), self.previous_autosave_path)
+
+        # One worker so journal records are written in order, off the GUI thread
+        self.autosave = AutosaveJournal(os.path.join(autosave_dir, "board"))
+        self.autosave_executor = ThreadPoolExecutor(max_workers=1)
+        self.reset_autosave()
+
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.timeout.connect(self.autosave_changes)
+        self.autosave_timer.start(AUTOSAVE_INTERVAL_MS)
+
+    def submit_autosave(self, fn, *args):
+        future = self.autosave_executor.submit(fn, *args)
+        future.add_done_callback(self.autosave_done)
+
+    def autosave_done(self, future):
+        if future.exception():
+            log.warning("autosave failed: %s", future.exception())
+
+    def reset_autosave(self):
+        self.board.take_changes()
+        pages = snapshot_pages(self.board.to_pages())
+        self.submit_autosave(self.autosave.reset, self.board.title, pages)
+
+    def autosave_changes(self):
+        changed, meta_dirty = self.board.take_changes()
+        if not changed and not meta_dirty:
+            return
 
-        try:
-            with open(filename, "w") as f:
-                json.dump(data, f)
-            QMessageBox.information(self, "Save Project", "Project saved successfully.")
-        except Exception as e:
-            QMessageBox.critical(self, "Save Project", f"Failed to save project:\n{str(e)}")
+        changed_rows = []
+        for index in changed:
+            row_data = self.board.row(index)
+            row_data["panel"] = snapshot_panel(row_data["panel"])
+            row_data["page"], row_data["row"] = self.board.locate(index)
+            changed_rows.append(row_data)
+        self.submit_autosave(self.autosave.write, self.board.title, self.board.page_meta(), changed_rows)
 
+    def save_project(self):
+        filename, _ = QFileDialog.getSaveFileName(self, "Save Project", "", f"Storyboard Project (*{PROJECT_EXTENSION})")
+        if not filename:
+            return
+        if not filename.endswith(PROJECT_EXTENSION):
+            filename += PROJECT_EXTENSION
+
+        # Encoding works on a snapshot, so the board stays editable while it saves
+        pages = snapshot_pages(self.board.to_pages())
+        self.start_project_task("Saving", self.on_project_saved, "Save Project",
+                                save_project_file, filename, self.board.title, pages)
 
+    def on_project_saved(self, result):
+        QMessageBox.information(self, "Save Project", "Project saved successfully.")
 
     def load_project(self):
-        filename, _ = QFileDialog.getOpenFileName(self, "Load Project", "", "Storyboard Project (*.json)")
+        filename, _ = QFileDialog.getOpenFileName(self, "Load Project", "",
+                                                  f"Storyboard Project (*{PROJECT_EXTENSION} *{LEGACY_EXTENSION})")
         if not filename:
             return
 
-        try:
-            with open(filename, "r") as f:
-                data = json.load(f)
-        except Exception as e:
-            QMessageBox.critical(self, "Load Project", f"Failed to load project:\n{str(e)}")
-            return
+        self.start_project_task("Loading", self.on_project_loaded, "Load Project", load_project_file, filename)
 
-        self.title_edit.setText(data.get("title", ""))
-
-        pages_data = data.get("pages", [])
-        for i, page_data in enumerate(pages_data):
-            if i >= len(self.pages):
-                break
-            page = self.pages[i]
-            page.start_number = page_data.get("start_number", page.start_number)
-            mode = page_data.get("mode", "upload")
-            if "draw" in mode:
-                page.switch_to_draw_mode()
-            else:
-                page.switch_to_upload_mode()
-            rows = page_data.get("rows", [])
-            for row_idx, row_data in enumerate(rows):
-                if row_idx >= ROWS_PER_PAGE:
-                    break
-                s, f = row_data.get("duration", (0, 0))
-                page.duration_widgets[row_idx].seconds_edit.setText(str(s))
-                page.duration_widgets[row_idx].frames_edit.setText(str(f))
-                description = row_data.get("description", "")
-                if page.item(row_idx, 2):
-                    page.item(row_idx, 2).setText(description)
-                else:
-                    page.setItem(row_idx, 2, QTableWidgetItem(description))
-
-                img_data_hex = row_data.get("image_data")
-                if img_data_hex:
-                    img_bytes = bytes.fromhex(img_data_hex)
-                    img = Image.open(io.BytesIO(img_bytes)).convert("RGBA")
-                    page.uploaded_images[row_idx] = img
-                    if page.mode == "upload":
-                        cell_width = page.columnWidth(1) or 150
-                        cell_height = page.rowHeight(row_idx) or 50
-                        qt_pixmap = page.pil_to_qpixmap_scaled(img, cell_width, cell_height)
-                        btn = page.create_fixed_size_button(pixmap=qt_pixmap, row=row_idx)
-                        btn.setFixedSize(cell_width, cell_height)
-                        page.setCellWidget(row_idx, 1, btn)
-                    elif page.mode == "draw":
-                        dw = DrawingWidget(page.columnWidth(1), page.rowHeight(row_idx))
-                        dw.image = img.resize((dw.width(), dw.height()), Image.LANCZOS)
-                        dw.draw = ImageDraw.Draw(dw.image)
-                        dw.update_pixmap()
-                        page.draw_widgets[row_idx] = dw
-                        page.setCellWidget(row_idx, 1, dw)
-                else:
-                    page.uploaded_images[row_idx] = None
-                    if page.mode == "upload":
-                        page._add_upload_button(row_idx)
-                    else:
-                        if page.draw_widgets[row_idx] is None:
-                            dw = DrawingWidget(page.columnWidth(1), page.rowHeight(row_idx))
-                            page.draw_widgets[row_idx] = dw
-                            page.setCellWidget(row_idx, 1, dw)
-
-        self.update_view()
+    def on_project_loaded(self, result):
+        self.apply_project(*result)
         QMessageBox.information(self, "Load Project", "Project loaded successfully.")
 
+    def start_project_task(self, label, on_finished, error_title, fn, *args):
+        if self.project_task is not None:
+            return
 
-    def render_frame_for_export(self, index):
-        from PIL import Image, ImageDraw, ImageFont
-
-        pil_image = self.frames[index]
-        target_w, target_h = 1920, 1080
-        target_ratio = 16 / 9
-
-        bg = Image.new("RGBA", (target_w, target_h), COLOR_BLACK)
-
-        if pil_image:
-            img_ratio = pil_image.width / pil_image.height
-            if img_ratio > target_ratio:
-                new_w = target_w
-                new_h = int(target_w / img_ratio)
-            else:
-                new_h = target_h
-                new_w = int(target_h * img_ratio)
-            resized_img = pil_image.resize((new_w, new_h), Image.LANCZOS)
-            x_offset = (target_w - new_w) // 2
-            y_offset = (target_h - new_h) // 2
-            bg.paste(resized_img, (x_offset, y_offset))
-
-        draw = ImageDraw.Draw(bg)
-
-        # Storyboard number
-        font_size = max(24, target_h // 20)
+        for action in self.project_actions:
+            action.setEnabled(False)
+        self.project_progress.setFormat(f"{label} %v/%m")
+        self.project_progress.setRange(0, 0)
+        self.project_progress.show()
+
+        task = ProjectTask(fn, *args)
+        task.signals.progress.connect(self.on_project_task_progress)
+        task.signals.finished.connect(lambda result: self.on_project_task_done(on_finished, result))
+        task.signals.failed.connect(lambda message: self.on_project_task_failed(error_title, message))
+        self.project_task = task
+        QThreadPool.globalInstance().start(task)
+
+    def on_project_task_progress(self, done, total):
+        self.project_progress.setRange(0, total)
+        self.project_progress.setValue(done)
+
+    def end_project_task(self):
+        self.project_task = None
+        self.project_progress.hide()
+        for action in self.project_actions:
+            action.setEnabled(True)
+
+    def on_project_task_done(self, on_finished, result):
+        self.end_project_task()
+        on_finished(result)
+
+    def on_project_task_failed(self, error_title, message):
+        self.end_project_task()
+        QMessageBox.critical(self, error_title, f"Failed to {error_title.lower()}:\n{message}")
+
+    def recover_autosave(self):
         try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except IOError:
-            font = ImageFont.load_default()
-
-        text = f"#{self.numbers[index]}"
-        margin = 10
-        text_pos = (margin, margin)
-        shadow_color = COLOR_BLACK
-        text_color = COLOR_WHITE
-
-        for offset in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-            pos = (text_pos[0] + offset[0], text_pos[1] + offset[1])
-            draw.text(pos, text, font=font, fill=shadow_color)
-        draw.text(text_pos, text, font=font, fill=text_color)
-
-        # Description bottom-right
-        description = getattr(self, "descriptions", [""] * len(self.frames))[index]
-        if description:
-            desc_font_size = max(18, target_h // 30)
-            try:
-                desc_font = ImageFont.truetype("arial.ttf", desc_font_size)
-            except IOError:
-                desc_font = ImageFont.load_default()
-            desc_w, desc_h = draw.textbbox((0, 0), description, font=desc_font)[2:]
-            desc_pos = (target_w - desc_w - 15, target_h - desc_h - 15)
-            for offset in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-                pos = (desc_pos[0] + offset[0], desc_pos[1] + offset[1])
-                draw.text(pos, description, font=desc_font, fill=shadow_color)
-            draw.text(desc_pos, description, font=desc_font, fill=text_color)
-
-        return bg
+            recovered = load_autosave(self.previous_autosave_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Recover Autosave", f"Failed to recover autosave:\n{str(e)}")
+            return
+        if recovered is None:
+            QMessageBox.information(self, "Recover Autosave", "There is no autosave from the last session.")
+            return
 
-    def export_spread(self):
-        left_idx = self.current_spread_index * 2
-        right_idx = left_idx + 1
+        self.apply_project(*recovered)
+        QMessageBox.information(self, "Recover Autosave", "Autosave recovered.")
+
+    def apply_project(self, title, pages_data):
+        # Every page keeps the mode it was saved in, the tables pick it up from the board
+        self.panel_imports.cancel()
+        # Nothing decoded or thumbnailed for the previous project is asked for again
+        panel_cache.clear()
+        self.panel_thumbnails.clear()
+        thumbnails.clear()
+        self.board.load(title, pages_data, min_pages=DEFAULT_PAGE_COUNT)
+        self.title_edit.setText(title)
+        self.reset_autosave()
+
+    def closeEvent(self, event):
+        # Bulk import workers still reading files would otherwise keep the app alive
+        self.panel_imports.cancel()
+        # Let a thumbnail or upload still being made finish before the views it is for go away
+        thumbnails.shutdown()
+        importer.shutdown()
+        super().closeEvent(event)
 
-        containers_to_export = []
-        if left_idx < len(self.page_containers):
-            containers_to_export.append(self.page_containers[left_idx])
-        if right_idx < len(self.page_containers):
-            containers_to_export.append(self.page_containers[right_idx])
+    def export_spread(self):
+        containers_to_export = [container for container in self.page_containers if not container.isHidden()]
 
         if not containers_to_export:
             QMessageBox.warning(self, "Export Spread", "No spread to export.")
@@ -1248,6 +1843,8 @@ class StoryboardPlanner(QMainWindow):
 
 
 if __name__ == "__main__":
+    # Export workers are spawned processes, a frozen build has to hand them off before starting the app
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     app.setStyle('fusion')
     window = StoryboardPlanner()
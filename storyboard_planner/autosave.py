@@ -0,0 +1,180 @@
+import json
+import os
+import struct
+
+from storyboard_planner.project import (
+    PROJECT_EXTENSION, LazyPanel, encode_panel, make_lazy_panel, save_project_file, load_project_file
+)
+
+# Autosave is a .csbp snapshot plus a journal of the rows edited since, folded back in now and then
+JOURNAL_EXTENSION = ".journal"
+RECORD_HEADER = struct.Struct("<II")
+COMPACT_EVERY_RECORDS = 50
+COMPACT_JOURNAL_BYTES = 64 * 1024 * 1024
+
+
+def empty_row(mode="upload"):
+    return {"duration": (0, 0), "description": "", "mode": mode, "panel": None}
+
+
+class AutosaveJournal:
+    def __init__(self, base_path, compact_every=COMPACT_EVERY_RECORDS, compact_bytes=COMPACT_JOURNAL_BYTES):
+        self.snapshot_path = base_path + PROJECT_EXTENSION
+        self.journal_path = base_path + JOURNAL_EXTENSION
+        self.compact_every = compact_every
+        self.compact_bytes = compact_bytes
+        self.title = ""
+        self.pages = []  # [{"start_number", "mode", "rows": [row, ...]}] with panels as LazyPanels
+        self.records = 0
+
+    def reset(self, title, pages):
+        # Take the whole board as the new baseline and write it as the snapshot
+        self.title = title
+        self.pages = []
+        for page in pages:
+            rows = [dict(row, panel=self.encode_row_panel(row.get("panel"))) for row in page["rows"]]
+            self.pages.append({"start_number": page["start_number"], "mode": page["mode"], "rows": rows})
+        self.compact()
+
+    def write(self, title, page_meta, changed_rows):
+        # page_meta: [{"start_number", "mode"}] for every page
+        # changed_rows: [{"page", "row", "duration", "description", "mode", "panel"}] for the edited rows only
+        self.title = title
+        self.apply_page_meta(page_meta)
+
+        header_rows = []
+        blobs = []
+        for change in changed_rows:
+            lazy_panel = self.encode_row_panel(change.get("panel"))
+            png_bytes = lazy_panel.png_bytes if lazy_panel else None
+            strokes_bytes = lazy_panel.strokes_bytes if lazy_panel else None
+            header_rows.append({
+                "page": change["page"],
+                "row": change["row"],
+                "duration": list(change["duration"]),
+                "description": change["description"],
+                "mode": change["mode"],
+                "size": list(lazy_panel.known_size) if lazy_panel and lazy_panel.known_size else None,
+                "image": len(png_bytes) if png_bytes else 0,
+                "strokes": len(strokes_bytes) if strokes_bytes else 0,
+            })
+            blobs.extend(blob for blob in (png_bytes, strokes_bytes) if blob)
+            self.set_row(change["page"], change["row"], {
+                "duration": tuple(change["duration"]),
+                "description": change["description"],
+                "mode": change["mode"],
+                "panel": lazy_panel,
+            })
+
+        header = json.dumps({"title": title, "pages": page_meta, "rows": header_rows}).encode("utf-8")
+        payload = b"".join(blobs)
+        with open(self.journal_path, "ab") as f:
+            f.write(RECORD_HEADER.pack(len(header), len(payload)))
+            f.write(header)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self.records += 1
+
+        if self.records >= self.compact_every or os.path.getsize(self.journal_path) >= self.compact_bytes:
+            self.compact()
+
+    def compact(self):
+        save_project_file(self.snapshot_path, self.title, self.pages, workers=1)
+        with open(self.journal_path, "wb"):
+            pass
+        self.records = 0
+
+    def encode_row_panel(self, panel):
+        if panel is None or isinstance(panel, LazyPanel):
+            return panel
+        png_bytes, strokes_bytes = encode_panel(panel)
+        return make_lazy_panel(png_bytes, strokes_bytes, panel.size)
+
+    def apply_page_meta(self, page_meta):
+        for index, meta in enumerate(page_meta):
+            while index >= len(self.pages):
+                self.pages.append({"start_number": None, "mode": meta["mode"], "rows": []})
+            self.pages[index]["start_number"] = meta["start_number"]
+            self.pages[index]["mode"] = meta["mode"]
+
+    def set_row(self, page_index, row_index, row):
+        rows = self.pages[page_index]["rows"]
+        while row_index >= len(rows):
+            rows.append(empty_row(self.pages[page_index]["mode"]))
+        rows[row_index] = row
+
+
+def read_journal(journal_path):
+    # Yields (header, payload) for every complete record, a torn record at the end is ignored
+    if not os.path.exists(journal_path):
+        return
+    with open(journal_path, "rb") as f:
+        data = f.read()
+
+    offset = 0
+    while offset + RECORD_HEADER.size <= len(data):
+        header_size, payload_size = RECORD_HEADER.unpack_from(data, offset)
+        start = offset + RECORD_HEADER.size
+        end = start + header_size + payload_size
+        if end > len(data):
+            break
+        header = json.loads(data[start:start + header_size])
+        yield header, data[start + header_size:end]
+        offset = end
+
+
+def load_autosave(base_path):
+    # Returns (title, pages) like load_project_file, or None if there is nothing to recover
+    journal = AutosaveJournal(base_path)
+    if not os.path.exists(journal.snapshot_path) and not os.path.exists(journal.journal_path):
+        return None
+
+    if os.path.exists(journal.snapshot_path):
+        journal.title, journal.pages = load_project_file(journal.snapshot_path)
+
+    for header, payload in read_journal(journal.journal_path):
+        journal.title = header["title"]
+        journal.apply_page_meta(header["pages"])
+        offset = 0
+        for row in header["rows"]:
+            png_bytes = payload[offset:offset + row["image"]] or None
+            offset += row["image"]
+            strokes_bytes = payload[offset:offset + row["strokes"]] or None
+            offset += row["strokes"]
+            journal.set_row(row["page"], row["row"], {
+                "duration": tuple(row["duration"]),
+                "description": row["description"],
+                "mode": row["mode"],
+                "panel": make_lazy_panel(png_bytes, strokes_bytes, row.get("size")),
+            })
+    return journal.title, journal.pages
+
+
+def has_edits(base_path):
+    # Whether an autosave holds anything beyond an empty board
+    if next(read_journal(base_path + JOURNAL_EXTENSION), None) is not None:
+        return True
+    if not os.path.exists(base_path + PROJECT_EXTENSION):
+        return False
+    try:
+        title, pages = load_project_file(base_path + PROJECT_EXTENSION)
+    except Exception:
+        # Unreadable, keep it rather than lose whatever it was
+        return True
+    return bool(title) or any(row["panel"] is not None or row["description"] or any(row["duration"])
+                              for page in pages for row in page["rows"])
+
+
+def rotate_autosave(base_path, previous_base_path):
+    # Keep the last session's autosave around for recovery before a new session starts writing. A session that
+    # never edited anything leaves the one before it in place, so a launch that is closed straight away does not
+    # push a crashed session's work out. Returns whether it rotated.
+    if not has_edits(base_path):
+        return False
+    for extension in (PROJECT_EXTENSION, JOURNAL_EXTENSION):
+        if os.path.exists(base_path + extension):
+            os.replace(base_path + extension, previous_base_path + extension)
+        elif os.path.exists(previous_base_path + extension):
+            os.remove(previous_base_path + extension)
+    return True
@@ -0,0 +1,247 @@
+from array import array
+
+from storyboard_planner.tiles import COLOR_WHITE, TiledImage
+
+# The board without Qt. Durations are two flat int arrays so totals are a slice sum, listeners get (index, field)
+# after every change with index None when the whole board changed
+ROWS_PER_PAGE = 6
+DEFAULT_MODE = "upload"
+BLANK_PANEL_SIZE = (854, 480)
+# Durations are typed in by hand, anything outside a C int would not fit the arrays
+DURATION_MAX = 2 ** 31 - 1
+
+
+def clamp_duration(value):
+    return max(0, min(int(value), DURATION_MAX))
+
+
+class Cut:
+    __slots__ = ("description", "panel", "version")
+
+    def __init__(self, description="", panel=None):
+        self.description = description
+        self.panel = panel
+        # Bumped whenever the panel is replaced, so anything derived from it can tell it is stale
+        self.version = 0
+
+
+class Page:
+    __slots__ = ("start_number", "mode")
+
+    def __init__(self, start_number, mode=DEFAULT_MODE):
+        self.start_number = start_number
+        self.mode = mode
+
+
+class Board:
+    def __init__(self, page_count=0, rows_per_page=ROWS_PER_PAGE):
+        self.rows_per_page = rows_per_page
+        self.title = ""
+        self.pages = []
+        self.cuts = []
+        self.seconds = array("i")
+        self.frames = array("i")
+        self.listeners = []
+        self.dirty = set()  # Cuts edited since the last take_changes()
+        self.meta_dirty = False  # Title or page settings changed since the last take_changes()
+        self.append_pages(page_count)
+        self.dirty.clear()
+        self.meta_dirty = False
+
+    @classmethod
+    def from_pages(cls, title, pages, rows_per_page=ROWS_PER_PAGE):
+        board = cls(rows_per_page=rows_per_page)
+        board.load(title, pages)
+        return board
+
+    def __len__(self):
+        return len(self.cuts)
+
+    @property
+    def page_count(self):
+        return len(self.pages)
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def notify(self, index, field):
+        for listener in list(self.listeners):
+            listener(index, field)
+
+    def cut_index(self, page, row):
+        return page * self.rows_per_page + row
+
+    def locate(self, index):
+        # (page, row) of a cut
+        return divmod(index, self.rows_per_page)
+
+    def page_range(self, page):
+        start = page * self.rows_per_page
+        return start, start + self.rows_per_page
+
+    def number(self, index):
+        page, row = self.locate(index)
+        return self.pages[page].start_number + row
+
+    def append_pages(self, count=1, mode=None):
+        if count <= 0:
+            return
+        mode = mode or (self.pages[-1].mode if self.pages else DEFAULT_MODE)
+        first_new = len(self.cuts)
+        for _ in range(count):
+            self.pages.append(Page(len(self.cuts) + 1, mode))
+            self.cuts.extend(Cut() for _ in range(self.rows_per_page))
+        added = count * self.rows_per_page
+        self.seconds.extend([0] * added)
+        self.frames.extend([0] * added)
+        # New rows go into the next autosave like any other edit
+        self.dirty.update(range(first_new, len(self.cuts)))
+        self.meta_dirty = True
+        self.notify(None, "pages")
+
+    def duration(self, index):
+        return self.seconds[index], self.frames[index]
+
+    def set_duration(self, index, seconds, frames):
+        seconds, frames = clamp_duration(seconds), clamp_duration(frames)
+        if self.seconds[index] == seconds and self.frames[index] == frames:
+            return
+        self.seconds[index] = seconds
+        self.frames[index] = frames
+        self.dirty.add(index)
+        self.notify(index, "duration")
+
+    def description(self, index):
+        return self.cuts[index].description
+
+    def set_description(self, index, text):
+        cut = self.cuts[index]
+        if cut.description == text:
+            return
+        cut.description = text
+        self.dirty.add(index)
+        self.notify(index, "description")
+
+    def panel(self, index):
+        return self.cuts[index].panel
+
+    def set_panel(self, index, panel):
+        cut = self.cuts[index]
+        if cut.panel is None and panel is None:
+            return
+        cut.panel = panel
+        cut.version += 1
+        self.dirty.add(index)
+        self.notify(index, "panel")
+
+    def set_title(self, title):
+        if self.title == title:
+            return
+        self.title = title
+        self.meta_dirty = True
+        self.notify(None, "title")
+
+    def set_page_mode(self, page, mode):
+        if self.pages[page].mode == mode:
+            return
+        self.pages[page].mode = mode
+        self.meta_dirty = True
+        # A row carries its page's mode when saved
+        self.dirty.update(range(*self.page_range(page)))
+        self.notify(None, "mode")
+
+    def page_duration(self, page, fps):
+        # (seconds, frames) for one page, frames past a second carried over
+        return self.span_duration(*self.page_range(page), fps)
+
+    def board_duration(self, fps):
+        return self.span_duration(0, len(self.cuts), fps)
+
+    def span_duration(self, start, stop, fps):
+        seconds = sum(self.seconds[start:stop])
+        frames = sum(self.frames[start:stop])
+        return seconds + frames // fps, frames % fps
+
+    def row(self, index):
+        cut = self.cuts[index]
+        return {
+            "duration": (self.seconds[index], self.frames[index]),
+            "description": cut.description,
+            "mode": self.pages[index // self.rows_per_page].mode,
+            "panel": cut.panel,
+        }
+
+    def page_meta(self):
+        return [{"start_number": page.start_number, "mode": page.mode} for page in self.pages]
+
+    def to_pages(self):
+        # The board in the shape save_project_file and render_spreads take
+        pages = []
+        for page_index, page in enumerate(self.pages):
+            pages.append({
+                "start_number": page.start_number,
+                "mode": page.mode,
+                "rows": [self.row(index) for index in range(*self.page_range(page_index))],
+            })
+        return pages
+
+    def load(self, title, pages, min_pages=0):
+        # Replace the board with a loaded project, pages as load_project_file returns them
+        self.title = title
+        self.pages = []
+        self.cuts = []
+        seconds = []
+        frames = []
+        mode = DEFAULT_MODE
+        for page_index in range(max(len(pages), min_pages)):
+            # Pages past the end of the project are padded out empty
+            page_data = pages[page_index] if page_index < len(pages) else {}
+            mode = page_data.get("mode", mode)
+            self.pages.append(Page(page_data.get("start_number") or len(self.cuts) + 1, mode))
+            rows = page_data.get("rows", [])[:self.rows_per_page]
+            for row_data in rows:
+                s, f = row_data.get("duration", (0, 0))
+                seconds.append(clamp_duration(s))
+                frames.append(clamp_duration(f))
+                self.cuts.append(Cut(row_data.get("description", ""), row_data.get("panel") or None))
+            for _ in range(self.rows_per_page - len(rows)):
+                seconds.append(0)
+                frames.append(0)
+                self.cuts.append(Cut())
+        self.seconds = array("i", seconds)
+        self.frames = array("i", frames)
+        self.dirty.clear()
+        self.meta_dirty = False
+        self.notify(None, "board")
+
+    def take_changes(self):
+        # (sorted indices of the cuts edited since the last call, whether title or page settings changed)
+        changed = sorted(self.dirty)
+        meta_dirty = self.meta_dirty
+        self.dirty.clear()
+        self.meta_dirty = False
+        return changed, meta_dirty
+
+    def timed_cuts(self):
+        # Indices of the cuts that have a duration, the ones that play and export
+        seconds, frames = self.seconds, self.frames
+        return [index for index in range(len(self.cuts)) if seconds[index] or frames[index]]
+
+    def export_cuts(self, snapshot=None):
+        # (frames, durations, numbers, descriptions) for the cuts that have a duration. Empty panels become a blank
+        # white one. snapshot(panel) is applied to every panel, for handing them to another thread.
+        frames, durations, numbers, descriptions = [], [], [], []
+        blank = None
+        for index in self.timed_cuts():
+            panel = self.cuts[index].panel
+            if panel is None:
+                # Nothing draws on export frames, so the empty cuts can all share one
+                blank = blank or TiledImage(*BLANK_PANEL_SIZE, COLOR_WHITE)
+                panel = blank
+            elif snapshot is not None:
+                panel = snapshot(panel)
+            frames.append(panel)
+            durations.append((self.seconds[index], self.frames[index]))
+            numbers.append(self.number(index))
+            descriptions.append(self.cuts[index].description or "")
+        return frames, durations, numbers, descriptions
@@ -0,0 +1,145 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from storyboard_planner.board import Board
+from storyboard_planner.export import VIDEO_EXTENSIONS, export_animatic
+from storyboard_planner.project import load_project_file
+from storyboard_planner.sheets import render_contact_sheets, render_spreads
+
+# Headless renderer for batch jobs, PIL only so it runs without a display
+DEFAULT_FPS = 24
+FORMATS = ("spreads", "contact-sheet", "frames", "video")
+
+
+def parse_size(text):
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    return width, height
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m storyboard_planner",
+                                     description="Render storyboard projects without opening the app.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render = commands.add_parser("render", help="render one or more projects")
+    render.add_argument("projects", nargs="+", help=".csbp or legacy .json project files")
+    render.add_argument("--out", required=True,
+                        help="output directory, or a .mp4/.webm file when rendering one project to video")
+    render.add_argument("--format", choices=FORMATS, default="spreads", help="what to render (default: spreads)")
+    render.add_argument("--image-format", choices=("png", "jpg"), default="png",
+                        help="file type for spreads and contact sheets (default: png)")
+    render.add_argument("--container", choices=("mp4", "webm"), default="mp4",
+                        help="video file type when --out is a directory (default: mp4)")
+    render.add_argument("--fps", type=int, default=DEFAULT_FPS)
+    render.add_argument("--size", type=parse_size, default=(1920, 1080),
+                        help="frame size for frames and video (default: 1920x1080)")
+    render.add_argument("--columns", type=int, default=5, help="contact sheet columns (default: 5)")
+    render.add_argument("--rows", type=int, default=6, help="contact sheet rows per sheet (default: 6)")
+    render.add_argument("--jobs", type=int, default=1, help="projects rendered at the same time (default: 1)")
+    render.add_argument("--workers", type=int, default=None,
+                        help="processes per project for frames and video (default: all CPUs when --jobs is 1)")
+    return parser
+
+
+def output_name(project_path):
+    return os.path.splitext(os.path.basename(project_path))[0]
+
+
+def save_images(images, directory, stem, kind, image_format):
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index, image in enumerate(images, 1):
+        path = os.path.join(directory, f"{stem}_{kind}_{index:02d}.{image_format}")
+        image.save(path, "JPEG" if image_format == "jpg" else "PNG")
+        paths.append(path)
+    return paths
+
+
+def render_project(project_path, out, options):
+    # Returns a list of the paths written. options is the parsed argparse namespace.
+    board = Board.from_pages(*load_project_file(project_path))
+    stem = output_name(project_path)
+
+    if options.format == "spreads":
+        return save_images(render_spreads(board.title, board.to_pages(), options.fps), out, stem, "spread",
+                           options.image_format)
+
+    frames, durations, numbers, descriptions = board.export_cuts()
+    if not frames:
+        return []
+
+    if options.format == "contact-sheet":
+        cuts = list(zip(frames, durations, numbers, descriptions))
+        sheets = render_contact_sheets(board.title, cuts, options.fps, options.columns, options.rows)
+        return save_images(sheets, out, stem, "contact", options.image_format)
+
+    if options.format == "frames":
+        target = os.path.join(out, stem)
+    elif out.lower().endswith(VIDEO_EXTENSIONS):
+        target = out
+    else:
+        os.makedirs(out, exist_ok=True)
+        target = os.path.join(out, f"{stem}.{options.container}")
+    path = export_animatic(target, frames, durations, numbers, descriptions, options.fps, options.size,
+                           workers=options.workers)
+    return [path]
+
+
+def run_render(options):
+    if options.format == "video" and options.out.lower().endswith(VIDEO_EXTENSIONS) and len(options.projects) > 1:
+        print("--out must be a directory when rendering several projects to video", file=sys.stderr)
+        return 2
+    if options.jobs > 1 and options.workers is None:
+        # The projects already keep every CPU busy
+        options.workers = 1
+
+    started = time.perf_counter()
+    if options.jobs <= 1:
+        results = []
+        for project_path in options.projects:
+            try:
+                results.append((project_path, render_project(project_path, options.out, options), None))
+            except Exception as e:
+                results.append((project_path, None, e))
+            report(*results[-1], video=options.format == "video")
+    else:
+        pool = ProcessPoolExecutor(max_workers=options.jobs, mp_context=multiprocessing.get_context("spawn"))
+        with pool:
+            futures = {pool.submit(render_project, project_path, options.out, options): project_path
+                       for project_path in options.projects}
+            results = []
+            for future in as_completed(futures):
+                try:
+                    results.append((futures[future], future.result(), None))
+                except Exception as e:
+                    results.append((futures[future], None, e))
+                report(*results[-1], video=options.format == "video")
+
+    failures = sum(1 for _, _, error in results if error is not None)
+    print(f"Rendered {len(results) - failures} of {len(results)} projects in {time.perf_counter() - started:.1f} s")
+    return 1 if failures else 0
+
+
+def report(project_path, paths, error, video=False):
+    if error is not None:
+        print(f"{project_path}: failed: {error}", file=sys.stderr)
+    elif not paths:
+        print(f"{project_path}: nothing to render (no cut has a duration)")
+    else:
+        for path in paths:
+            note = " (ffmpeg not found, wrote PNG frames)" if video and os.path.isdir(path) else ""
+            print(f"{project_path}: {path}{note}")
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    if options.command == "render":
+        return run_render(options)
+    return 2
@@ -0,0 +1,195 @@
+import io
+import multiprocessing
+import os
+import shutil
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from storyboard_planner.fonts import get_font
+from storyboard_planner.playback import Timeline
+from storyboard_planner.render import fit_size
+from storyboard_planner.sprites import COLOR_BLACK, paste_text
+
+# Each cut is rendered once and written once per frame of its duration. Video is piped to ffmpeg, without it
+# the frames become a PNG sequence with repeats hard-linked
+EXPORT_SIZE = (1920, 1080)
+VIDEO_EXTENSIONS = (".mp4", ".webm")
+SEQUENCE_PATTERN = "frame_{:06d}.png"
+FFMPEG_ENV = "CSBP_FFMPEG"
+FFMPEG_CODECS = {
+    ".mp4": ["-c:v", "libx264", "-preset", "medium", "-crf", "20", "-pix_fmt", "yuv420p", "-movflags", "+faststart"],
+    ".webm": ["-c:v", "libvpx-vp9", "-crf", "32", "-b:v", "0", "-row-mt", "1", "-pix_fmt", "yuv420p"],
+}
+
+# Workers are spawned rather than forked, the GUI has other threads that may hold locks
+EXPORT_IN_FLIGHT_PER_WORKER = 2
+
+
+def render_export_frame(panel, number, description="", size=EXPORT_SIZE):
+    target_w, target_h = size
+    bg = Image.new("RGBA", (target_w, target_h), COLOR_BLACK)
+
+    if panel is not None:
+        new_w, new_h = fit_size(panel.width, panel.height, target_w, target_h)
+        resized_img = panel.resize((new_w, new_h), Image.LANCZOS)
+        bg.paste(resized_img, ((target_w - new_w) // 2, (target_h - new_h) // 2))
+
+    # Draw storyboard number
+    font = get_font(max(24, target_h // 20))
+    paste_text(bg, (10, 10), f"#{number}", font, 1)
+
+    # Draw description bottom-right
+    if description:
+        desc_font = get_font(max(18, target_h // 30))
+        desc_w, desc_h = desc_font.getbbox(description)[2:]
+        paste_text(bg, (target_w - desc_w - 15, target_h - desc_h - 15), description, desc_font, 1)
+
+    return bg.convert("RGB")
+
+
+def encode_raw(image):
+    return image.tobytes()
+
+
+def encode_png(image):
+    with io.BytesIO() as output:
+        image.save(output, format="PNG")
+        return output.getvalue()
+
+
+def render_cut_payload(panel, number, description, size, encoder):
+    # Runs in the worker processes
+    return encoder(render_export_frame(panel, number, description, size))
+
+
+def default_workers():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def render_cuts(jobs, encoder, workers=None, in_flight=None):
+    # Yields encoded cuts in the order of jobs. jobs: [(panel, number, description, size)]
+    workers = min(workers or default_workers(), len(jobs))
+    if workers <= 1:
+        for job in jobs:
+            yield render_cut_payload(*job, encoder)
+        return
+
+    in_flight = in_flight or workers * EXPORT_IN_FLIGHT_PER_WORKER
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        pending = deque()
+        remaining = iter(jobs)
+        while True:
+            while len(pending) < in_flight:
+                job = next(remaining, None)
+                if job is None:
+                    break
+                pending.append(pool.submit(render_cut_payload, *job, encoder))
+            if not pending:
+                return
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def find_ffmpeg():
+    return os.environ.get(FFMPEG_ENV) or shutil.which("ffmpeg")
+
+
+class FFmpegWriter:
+    def __init__(self, filename, size, fps, executable):
+        extension = os.path.splitext(filename)[1].lower()
+        command = [
+            executable, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{size[0]}x{size[1]}", "-r", str(fps), "-i", "-",
+        ] + FFMPEG_CODECS.get(extension, FFMPEG_CODECS[".mp4"]) + [filename]
+        self.filename = filename
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    encoder = staticmethod(encode_raw)
+
+    def write_cut(self, data, count):
+        try:
+            for _ in range(count):
+                self.process.stdin.write(data)
+        except BrokenPipeError:
+            # ffmpeg gave up, close() reports why
+            pass
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        errors = self.process.stderr.read().decode("utf-8", "replace").strip()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with code {self.process.returncode}\n{errors[-2000:]}")
+
+    def abort(self):
+        self.process.kill()
+        self.process.wait()
+
+
+class ImageSequenceWriter:
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.filename = directory
+        self.frame = 0
+
+    encoder = staticmethod(encode_png)
+
+    def write_cut(self, data, count):
+        first = os.path.join(self.filename, SEQUENCE_PATTERN.format(self.frame))
+        with open(first, "wb") as f:
+            f.write(data)
+        for offset in range(1, count):
+            path = os.path.join(self.filename, SEQUENCE_PATTERN.format(self.frame + offset))
+            if os.path.exists(path):
+                os.remove(path)
+            try:
+                os.link(first, path)
+            except OSError:
+                shutil.copyfile(first, path)
+        self.frame += count
+
+    def close(self):
+        pass
+
+    def abort(self):
+        pass
+
+
+def open_writer(filename, size, fps):
+    # Video if the name asks for it and ffmpeg is around, otherwise a PNG sequence in <name>_frames/
+    base, extension = os.path.splitext(filename)
+    executable = find_ffmpeg()
+    if extension.lower() in VIDEO_EXTENSIONS and executable:
+        return FFmpegWriter(filename, size, fps, executable)
+    if extension.lower() in VIDEO_EXTENSIONS:
+        return ImageSequenceWriter(base + "_frames")
+    return ImageSequenceWriter(filename)
+
+
+def export_animatic(filename, frames, durations, numbers, descriptions, fps, size=EXPORT_SIZE, progress=None,
+                    workers=None):
+    # Returns the path that was written: the video, or the frame directory if it fell back to a sequence.
+    # progress(done, total) is called per cut. workers=1 renders in this process.
+    timeline = Timeline(durations, fps)
+    cuts = [index for index, count in enumerate(timeline.cut_frames) if count]
+    jobs = [(frames[index], numbers[index], descriptions[index], size) for index in cuts]
+    writer = open_writer(filename, size, fps)
+    try:
+        for done, payload in enumerate(render_cuts(jobs, writer.encoder, workers), 1):
+            writer.write_cut(payload, timeline.cut_frames[cuts[done - 1]])
+            if progress:
+                progress(done, len(cuts))
+        writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.filename
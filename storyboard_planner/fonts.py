@@ -0,0 +1,90 @@
+import os
+import sys
+import threading
+
+from PIL import ImageFont
+
+# Fonts are loaded once per (family, size), Arial falls back to common Linux sans fonts and then Pillow's own
+DEFAULT_FAMILY = "arial"
+FONT_FILES = {
+    "arial": ("arial.ttf", "Arial.ttf", "LiberationSans-Regular.ttf", "Arimo-Regular.ttf", "DejaVuSans.ttf",
+              "NotoSans-Regular.ttf", "FreeSans.ttf", "Helvetica.ttc"),
+}
+
+
+def font_dirs():
+    if sys.platform == "win32":
+        return [os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts")]
+    if sys.platform == "darwin":
+        return ["/Library/Fonts", "/System/Library/Fonts", os.path.expanduser("~/Library/Fonts")]
+    data_dirs = [os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")]
+    data_dirs += (os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share").split(":")
+    return [os.path.join(d, "fonts") for d in data_dirs if d] + [os.path.expanduser("~/.fonts")]
+
+
+def find_font_file(file_names):
+    # First match in the system font directories, in the order of file_names
+    wanted = {name.lower(): rank for rank, name in enumerate(file_names)}
+    best = None
+    for directory in font_dirs():
+        for root, dirs, files in os.walk(directory):
+            for name in files:
+                rank = wanted.get(name.lower())
+                if rank is not None and (best is None or rank < best[0]):
+                    best = (rank, os.path.join(root, name))
+                    if rank == 0:
+                        return best[1]
+    return best[1] if best else None
+
+
+class FontService:
+    def __init__(self, font_files=FONT_FILES):
+        self.font_files = font_files
+        self.paths = {}  # family -> font file path, or None for Pillow's built-in font
+        self.fonts = {}  # (family, size) -> font
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, size, family=DEFAULT_FAMILY):
+        key = (family, size)
+        with self.lock:
+            font = self.fonts.get(key)
+            if font is not None:
+                self.hits += 1
+                return font
+            self.misses += 1
+            font = self.load(family, size)
+            self.fonts[key] = font
+            return font
+
+    def resolve(self, family):
+        if family not in self.paths:
+            file_names = self.font_files.get(family.lower(), (family,))
+            try:
+                # Pillow finds the preferred file itself if it is in the working directory or a font folder
+                ImageFont.truetype(file_names[0], 10)
+                self.paths[family] = file_names[0]
+            except IOError:
+                self.paths[family] = find_font_file(file_names)
+        return self.paths[family]
+
+    def load(self, family, size):
+        path = self.resolve(family)
+        if path:
+            try:
+                return ImageFont.truetype(path, size)
+            except IOError:
+                pass
+        try:
+            return ImageFont.load_default(size)
+        except TypeError:
+            # Pillow before 10.1 only has the fixed-size bitmap font
+            return ImageFont.load_default()
+
+
+fonts = FontService()
+
+
+def get_font(size, family=DEFAULT_FAMILY):
+    return fonts.get(size, family)
@@ -0,0 +1,118 @@
+import zlib
+
+from PIL import Image
+
+from storyboard_planner.tiles import TiledImage
+
+# Undo history for the drawing canvas, each stroke keeps the tiles it touched zlib-compressed
+DEFAULT_HISTORY_BUDGET = 16 * 1024 * 1024
+
+
+def pack_tile(tile):
+    if isinstance(tile, tuple):
+        return tile
+    return zlib.compress(tile.tobytes(), 1)
+
+
+def unpack_tile(data, size):
+    if isinstance(data, tuple):
+        return data
+    return Image.frombytes("RGBA", size, zlib.decompress(data))
+
+
+class StrokeDelta:
+    __slots__ = ("indices", "before", "after", "nbytes")
+
+    def __init__(self, indices, before, after):
+        self.indices = indices
+        self.before = before
+        self.after = after
+        self.nbytes = sum(len(data) if isinstance(data, bytes) else 4 for data in before + after)
+
+
+class StrokeHistory:
+    def __init__(self, image, memory_budget=DEFAULT_HISTORY_BUDGET, tiles=None):
+        # committed mirrors the canvas as of the last finished stroke, it is where "before" tiles come from
+        self.committed = tiles.copy() if tiles is not None else TiledImage.from_image(image)
+        self.memory_budget = memory_budget
+        self.undo_stack = []
+        self.redo_stack = []
+        self.nbytes = 0
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def commit(self, image, boxes):
+        indices = set()
+        for box in boxes:
+            indices.update(self.committed.tiles_in(box))
+        if not indices:
+            return None
+
+        indices = sorted(indices)
+        before = [self.committed.tiles[index] for index in indices]
+        self.committed.update_regions(image, boxes)
+        after = [self.committed.tiles[index] for index in indices]
+
+        changed = [i for i, (old, new) in enumerate(zip(before, after)) if not self._same(old, new)]
+        if not changed:
+            return None
+
+        delta = StrokeDelta([indices[i] for i in changed],
+                            [pack_tile(before[i]) for i in changed],
+                            [pack_tile(after[i]) for i in changed])
+
+        self.nbytes -= sum(entry.nbytes for entry in self.redo_stack)
+        self.redo_stack = []
+        self.undo_stack.append(delta)
+        self.nbytes += delta.nbytes
+        self._evict()
+        return delta
+
+    def undo(self, image):
+        if not self.undo_stack:
+            return None
+        delta = self.undo_stack.pop()
+        self.redo_stack.append(delta)
+        return self._apply(image, delta.indices, delta.before)
+
+    def redo(self, image):
+        if not self.redo_stack:
+            return None
+        delta = self.redo_stack.pop()
+        self.undo_stack.append(delta)
+        return self._apply(image, delta.indices, delta.after)
+
+    def _apply(self, image, indices, packed_tiles):
+        # Writes the tiles back into image and returns the bounding box that needs repainting
+        left = top = None
+        right = bottom = 0
+        for index, data in zip(indices, packed_tiles):
+            box = self.committed.tile_box(index)
+            tile = unpack_tile(data, (box[2] - box[0], box[3] - box[1]))
+            if isinstance(tile, tuple):
+                image.paste(tile, box)
+            else:
+                image.paste(tile, box[:2])
+            self.committed.tiles[index] = tile
+
+            left = box[0] if left is None else min(left, box[0])
+            top = box[1] if top is None else min(top, box[1])
+            right = max(right, box[2])
+            bottom = max(bottom, box[3])
+        if left is None:
+            return None
+        return left, top, right, bottom
+
+    def _evict(self):
+        while self.nbytes > self.memory_budget and len(self.undo_stack) > 1:
+            self.nbytes -= self.undo_stack.pop(0).nbytes
+
+    @staticmethod
+    def _same(old, new):
+        if isinstance(old, tuple) or isinstance(new, tuple):
+            return old == new
+        return old.tobytes() == new.tobytes()
@@ -0,0 +1,168 @@
+import io
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from PIL import Image
+
+from storyboard_planner.export import default_workers
+from storyboard_planner.project import make_lazy_panel
+from storyboard_planner.render import fit_size
+from storyboard_planner.thumbnails import THUMBNAIL_BASE_SIZE, MipPyramid
+from storyboard_planner.tiles import TiledImage
+
+# Imports decode a small preview first (JPEGs at reduced scale), then the full panel
+IMPORT_PREVIEW_SIZE = THUMBNAIL_BASE_SIZE
+IMPORT_WORKERS = 2
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
+
+# Bulk imports keep each file's bytes as a LazyPanel, formats other than these are converted to PNG
+IMPORT_KEEP_FORMATS = ("PNG", "JPEG")
+
+
+def shrink_image(image, size):
+    # RGBA copy of image that fits in size x size. It is shrunk by a whole factor first (a cheap box filter) so
+    # the LANCZOS pass only has the last step to do.
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    if image.width <= size and image.height <= size:
+        return image
+    width, height = fit_size(image.width, image.height, size, size)
+    factor = min(image.width // width, image.height // height)
+    if factor >= 2:
+        image = image.reduce(factor)
+    if image.size != (width, height):
+        image = image.resize((width, height), Image.LANCZOS)
+    return image
+
+
+def import_image(path, on_preview=None, preview_size=IMPORT_PREVIEW_SIZE):
+    # Decode an image file into a panel. on_preview(image) is handed the small RGBA preview first, before the
+    # full decode is done where the format allows it.
+    full = None
+    if on_preview is not None:
+        with Image.open(path) as image:
+            if image.draft(None, (preview_size, preview_size)) is None:
+                # No reduced decode for this format, the full decode has to come first
+                full = image.convert("RGBA")
+                on_preview(shrink_image(full, preview_size))
+            else:
+                on_preview(shrink_image(image, preview_size))
+    if full is None:
+        with Image.open(path) as image:
+            full = image.convert("RGBA")
+    return TiledImage.from_image(full)
+
+
+class ImageImporter:
+    def __init__(self, workers=IMPORT_WORKERS, preview_size=IMPORT_PREVIEW_SIZE):
+        self.workers = workers
+        self.preview_size = preview_size
+        self.executor = None  # Started on first use
+        self.lock = threading.Lock()
+
+    def submit(self, key, path, on_preview, on_done):
+        # Import path on the pool. on_preview(key, preview) gets the preview as a TiledImage, then
+        # on_done(key, panel, error) the full panel, or None and the error message if the file could not be read.
+        # Both are called from the worker thread.
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="imports")
+            return self.executor.submit(self.run, key, path, on_preview, on_done)
+
+    def run(self, key, path, on_preview, on_done):
+        try:
+            panel = import_image(path, lambda image: on_preview(key, TiledImage.from_image(image)),
+                                 self.preview_size)
+        except Exception as e:
+            on_done(key, None, str(e))
+            return
+        on_done(key, panel, None)
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+importer = ImageImporter()
+
+
+def natural_key(path):
+    # frame_2 sorts before frame_10
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", os.path.basename(path))]
+
+
+def is_image_file(path):
+    return path.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def list_images(directory):
+    # Image files directly inside directory, in natural order
+    paths = [os.path.join(directory, name) for name in os.listdir(directory)]
+    return sorted((path for path in paths if is_image_file(path) and os.path.isfile(path)), key=natural_key)
+
+
+def read_image_file(path, preview_size=IMPORT_PREVIEW_SIZE):
+    # Runs in the bulk import workers. Returns (image_bytes, (width, height), pyramid)
+    with Image.open(path) as image:
+        size = image.size
+        if image.format in IMPORT_KEEP_FORMATS:
+            # The preview is all that is decoded here, a JPEG only at reduced scale
+            image.draft(None, (preview_size, preview_size))
+            pyramid = MipPyramid(shrink_image(image, preview_size))
+            with open(path, "rb") as f:
+                return f.read(), size, pyramid
+        full = image.convert("RGBA")
+    pyramid = MipPyramid(shrink_image(full, preview_size))
+    with io.BytesIO() as output:
+        full.save(output, format="PNG")
+        return output.getvalue(), size, pyramid
+
+
+class BulkImport:
+    # Imports jobs = [(key, path)] on a process pool, or on a thread when there is a single worker.
+    # on_result(key, panel, pyramid, error) is called from a pool thread as each file finishes, in the order they
+    # finish. panel is a LazyPanel, or None with the error message if the file could not be read.
+    def __init__(self, jobs, on_result, workers=None, preview_size=IMPORT_PREVIEW_SIZE):
+        self.jobs = jobs
+        self.on_result = on_result
+        self.workers = min(workers or default_workers(), len(jobs)) or 1
+        self.preview_size = preview_size
+        self.executor = None
+        self.remaining = len(jobs)
+        self.lock = threading.Lock()
+
+    def start(self):
+        if self.workers <= 1:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bulk-import")
+        else:
+            # Spawned rather than forked for the same reason as the export workers
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                mp_context=multiprocessing.get_context("spawn"))
+        # The futures are not kept, a result is let go as soon as on_result has had it
+        for key, path in self.jobs:
+            future = self.executor.submit(read_image_file, path, self.preview_size)
+            future.add_done_callback(lambda future, key=key: self.finished(key, future))
+
+    def finished(self, key, future):
+        if future.cancelled():
+            return
+        try:
+            data, size, pyramid = future.result()
+        except Exception as e:
+            self.on_result(key, None, None, str(e))
+        else:
+            self.on_result(key, make_lazy_panel(data, None, size), pyramid, None)
+        with self.lock:
+            self.remaining -= 1
+            done = self.remaining == 0
+        if done:
+            self.executor.shutdown(wait=False)
+
+    def cancel(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,113 @@
+import time
+from bisect import bisect_right
+from itertools import accumulate
+
+# The play head comes from a monotonic clock, so late ticks drop frames instead of stretching the board
+
+
+class Timeline:
+    def __init__(self, durations, fps):
+        # durations: [(seconds, frames)] per cut
+        self.fps = fps
+        self.cut_frames = [max(0, round(s * fps) + f) for s, f in durations]
+        # cut_starts[i] is the first frame of cut i, the last entry is the length of the board
+        self.cut_starts = [0] + list(accumulate(self.cut_frames))
+
+    @property
+    def total_frames(self):
+        return self.cut_starts[-1]
+
+    def __len__(self):
+        return len(self.cut_frames)
+
+    def locate(self, frame):
+        # (cut index, frame within that cut) for a frame of the board, clamped to the board
+        frame = min(max(0, frame), max(0, self.total_frames - 1))
+        index = bisect_right(self.cut_starts, frame) - 1
+        # Zero-length cuts share their start with the next cut, bisect_right already skips past them
+        index = min(index, len(self.cut_frames) - 1)
+        return index, frame - self.cut_starts[index]
+
+    def cut_start(self, index):
+        return self.cut_starts[index]
+
+    def cut_range(self, index):
+        return self.cut_starts[index], self.cut_starts[index + 1]
+
+    def upcoming(self, index, count, loop=None):
+        # The next `count` cuts that will play after `index`, wrapping around inside a loop range
+        first, last = 0, len(self.cut_frames) - 1
+        if loop is not None:
+            first, last = self.locate(loop[0])[0], self.locate(loop[1] - 1)[0]
+        cuts = []
+        for step in range(count):
+            index += 1
+            if index > last:
+                if loop is None:
+                    break
+                index = first
+            if index in cuts:
+                break
+            cuts.append(index)
+        return cuts
+
+
+def wrap_frame(frame, loop):
+    # Fold a frame that ran past the end of the loop range back into it
+    start, end = loop
+    if frame < end or end <= start:
+        return frame
+    return start + (frame - start) % (end - start)
+
+
+class PlaybackClock:
+    def __init__(self, fps, now=time.perf_counter):
+        self.fps = fps
+        self.now = now
+        self.started_at = None
+        self.start_frame = 0
+
+    def start(self, frame=0):
+        self.start_frame = frame
+        self.started_at = self.now()
+
+    def stop(self):
+        self.start_frame = self.frame()
+        self.started_at = None
+
+    def seek(self, frame):
+        if self.started_at is None:
+            self.start_frame = frame
+        else:
+            self.start(frame)
+
+    def shift(self, frames):
+        # Move the play head without restarting the clock, so looping does not lose the part-frame in progress
+        self.start_frame += frames
+
+    @property
+    def running(self):
+        return self.started_at is not None
+
+    def frame(self):
+        if self.started_at is None:
+            return self.start_frame
+        return self.start_frame + int((self.now() - self.started_at) * self.fps)
+
+    def tick(self, total_frames, loop=None):
+        # Frame to show on a timer tick as (frame, finished). Past the end of the loop range the play head wraps
+        # round, past the end of the board the clock stops on the last frame and finished is True.
+        frame = self.frame()
+        if loop is not None and frame >= loop[1]:
+            wrapped = wrap_frame(frame, loop)
+            self.shift(wrapped - frame)
+            return wrapped, False
+        if frame >= total_frames:
+            self.stop()
+            self.seek(total_frames - 1)
+            return total_frames - 1, True
+        return frame, False
+
+
+def format_timecode(frame, fps):
+    return f"{frame // fps:02d}s + {frame % fps:02d}f"
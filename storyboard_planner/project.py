@@ -0,0 +1,314 @@
+import io
+import json
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from storyboard_planner.strokes import StrokeList, VectorDrawing
+from storyboard_planner.tiles import TiledImage
+
+# A project is a zip of manifest.json plus one member per panel, old single-JSON projects still load
+PROJECT_EXTENSION = ".csbp"
+LEGACY_EXTENSION = ".json"
+FORMAT_NAME = "csbp"
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+# Panels stay compressed until something needs their pixels
+PANEL_CACHE_BYTES = 512 * 1024 * 1024
+
+
+def panel_nbytes(panel):
+    # Decoded memory a panel holds, for the cache budget
+    if isinstance(panel, VectorDrawing):
+        # Its canvas-size raster is made on first use, count it from the start
+        return panel_nbytes(panel.background) + panel.width * panel.height * 4
+    if isinstance(panel, TiledImage):
+        return panel.nbytes
+    return 0
+
+
+class PanelCache:
+    def __init__(self, budget=PANEL_CACHE_BYTES):
+        self.budget = budget
+        self.entries = OrderedDict()  # LazyPanel -> (panel, nbytes)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        # Playback renders frames on a worker thread, so lookups can come from more than one thread
+        self.lock = threading.Lock()
+
+    def get(self, lazy_panel):
+        with self.lock:
+            entry = self.entries.get(lazy_panel)
+            if entry is not None:
+                self.entries.move_to_end(lazy_panel)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        panel = lazy_panel.decode()
+        nbytes = panel_nbytes(panel)
+        with self.lock:
+            if lazy_panel not in self.entries:
+                self.entries[lazy_panel] = (panel, nbytes)
+                self.nbytes += nbytes
+            # The newest panel is kept even when it alone is over the budget
+            while self.nbytes > self.budget and len(self.entries) > 1:
+                self.nbytes -= self.entries.popitem(last=False)[1][1]
+        return panel
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+
+panel_cache = PanelCache()
+
+
+class LazyPanel:
+    # Stand-in for a panel that has not been decoded yet, it answers like the decoded panel would
+    __slots__ = ("png_bytes", "strokes_bytes", "known_size")
+
+    def __init__(self, png_bytes, strokes_bytes, size=None):
+        self.png_bytes = png_bytes
+        self.strokes_bytes = strokes_bytes
+        self.known_size = tuple(size) if size else None
+
+    def decode(self):
+        return decode_panel(self.png_bytes, self.strokes_bytes)
+
+    def get(self):
+        return panel_cache.get(self)
+
+    @property
+    def size(self):
+        return self.known_size or self.get().size
+
+    @property
+    def width(self):
+        return self.size[0]
+
+    @property
+    def height(self):
+        return self.size[1]
+
+    def resize(self, size, resample=Image.LANCZOS):
+        return self.get().resize(size, resample)
+
+    def to_image(self):
+        return self.get().to_image()
+
+    def save(self, fp, format=None, **params):
+        self.get().save(fp, format, **params)
+
+
+def resolve_panel(panel):
+    return panel.get() if isinstance(panel, LazyPanel) else panel
+
+
+def make_lazy_panel(png_bytes, strokes_bytes, size=None):
+    if not png_bytes and not strokes_bytes:
+        return None
+    return LazyPanel(png_bytes, strokes_bytes, size)
+
+
+def snapshot_panel(panel):
+    # Cheap copy that is safe to encode on another thread while the UI keeps editing the original
+    if isinstance(panel, TiledImage):
+        return panel.copy()
+    if isinstance(panel, VectorDrawing):
+        return VectorDrawing(panel.strokes.copy(), background=panel.background, tiles=panel.tiles)
+    return panel
+
+
+def snapshot_pages(pages):
+    return [dict(page, rows=[dict(row, panel=snapshot_panel(row.get("panel"))) for row in page["rows"]])
+            for page in pages]
+
+
+def encode_panel(panel):
+    # Returns (png_bytes, strokes_bytes), either can be None
+    if panel is None:
+        return None, None
+    if isinstance(panel, LazyPanel):
+        # Never decoded since it was loaded, so the stored bytes are still current
+        return panel.png_bytes, panel.strokes_bytes
+    strokes_bytes = None
+    if isinstance(panel, VectorDrawing):
+        strokes_bytes = panel.strokes.to_bytes()
+        panel = panel.background
+    png_bytes = None
+    if panel is not None:
+        with io.BytesIO() as output:
+            panel.save(output, format="PNG")
+            png_bytes = output.getvalue()
+    return png_bytes, strokes_bytes
+
+
+def decode_panel(png_bytes, strokes_bytes):
+    panel = None
+    if png_bytes:
+        panel = TiledImage.from_image(Image.open(io.BytesIO(png_bytes)).convert("RGBA"))
+    if strokes_bytes:
+        panel = VectorDrawing(StrokeList.from_bytes(strokes_bytes), background=panel)
+    return panel
+
+
+def panel_member(page_index, row_index, kind):
+    return f"panels/{page_index:04d}_{row_index:02d}.{kind}"
+
+
+def image_kind(image_bytes):
+    # Panels are PNG, except images imported from JPEG files which keep their own bytes
+    return "jpg" if image_bytes[:3] == b"\xff\xd8\xff" else "png"
+
+
+def save_project_file(filename, title, pages, progress=None, workers=None):
+    # pages: [{"start_number", "mode", "rows": [{"duration", "description", "mode", "panel"}]}]
+    # progress(done, total) is called as panels are encoded. Panels are encoded on a thread pool
+    # (the PNG encoder releases the GIL), so pages must not be edited meanwhile, see snapshot_pages().
+    manifest = {"format": FORMAT_NAME, "version": FORMAT_VERSION, "title": title, "pages": []}
+
+    panels = [row.get("panel") for page in pages for row in page["rows"]]
+    encoded = []
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        for done, result in enumerate(executor.map(encode_panel, panels), 1):
+            encoded.append(result)
+            if progress:
+                progress(done, len(panels))
+    encoded = iter(encoded)
+
+    tmp_filename = filename + ".tmp"
+    try:
+        with zipfile.ZipFile(tmp_filename, "w") as archive:
+            for page_index, page in enumerate(pages):
+                page_manifest = {"start_number": page["start_number"], "mode": page["mode"], "rows": []}
+                for row_index, row in enumerate(page["rows"]):
+                    png_bytes, strokes_bytes = next(encoded)
+                    row_manifest = {
+                        "duration": list(row["duration"]),
+                        "description": row["description"],
+                        "mode": row.get("mode", page["mode"]),
+                        "image": None,
+                        "strokes": None,
+                        "size": list(row["panel"].size) if row.get("panel") else None,
+                    }
+                    if png_bytes:
+                        # PNG and JPEG are already compressed, storing them compressed again only costs time
+                        row_manifest["image"] = panel_member(page_index, row_index, image_kind(png_bytes))
+                        archive.writestr(row_manifest["image"], png_bytes, compress_type=zipfile.ZIP_STORED)
+                    if strokes_bytes:
+                        row_manifest["strokes"] = panel_member(page_index, row_index, "strokes")
+                        archive.writestr(row_manifest["strokes"], strokes_bytes, compress_type=zipfile.ZIP_DEFLATED)
+                    page_manifest["rows"].append(row_manifest)
+                manifest["pages"].append(page_manifest)
+
+            archive.writestr(MANIFEST_NAME, json.dumps(manifest), compress_type=zipfile.ZIP_DEFLATED)
+
+        os.replace(tmp_filename, filename)
+    except Exception:
+        # The previous file is left as it was, and no half-written one next to it
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+
+
+class ProjectArchive:
+    # Random access reader for a .csbp project
+    def __init__(self, filename):
+        self.filename = filename
+        self.archive = zipfile.ZipFile(filename, "r")
+        self.manifest = json.loads(self.archive.read(MANIFEST_NAME))
+        if self.manifest.get("format") != FORMAT_NAME:
+            self.archive.close()
+            raise ValueError(f"{filename} is not a storyboard project")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.archive.close()
+
+    @property
+    def title(self):
+        return self.manifest.get("title", "")
+
+    @property
+    def pages(self):
+        return self.manifest.get("pages", [])
+
+    def read_member(self, name):
+        return self.archive.read(name) if name else None
+
+    def read_panel(self, page_index, row_index):
+        row = self.pages[page_index]["rows"][row_index]
+        return decode_panel(self.read_member(row.get("image")), self.read_member(row.get("strokes")))
+
+    def read_lazy_panel(self, page_index, row_index):
+        row = self.pages[page_index]["rows"][row_index]
+        return make_lazy_panel(self.read_member(row.get("image")), self.read_member(row.get("strokes")),
+                               row.get("size"))
+
+
+def load_legacy_project(filename, progress=None):
+    with open(filename, "r") as f:
+        data = json.load(f)
+
+    pages = []
+    pages_data = data.get("pages", [])
+    for page_index, page_data in enumerate(pages_data):
+        rows = []
+        for row_data in page_data.get("rows", []):
+            img_data_hex = row_data.get("image_data")
+            strokes_hex = row_data.get("strokes")
+            rows.append({
+                "duration": tuple(row_data.get("duration", (0, 0))),
+                "description": row_data.get("description", ""),
+                "mode": row_data.get("mode", page_data.get("mode", "upload")),
+                "panel": make_lazy_panel(bytes.fromhex(img_data_hex) if img_data_hex else None,
+                                         bytes.fromhex(strokes_hex) if strokes_hex else None),
+            })
+        pages.append({
+            "start_number": page_data.get("start_number"),
+            "mode": page_data.get("mode", "upload"),
+            "rows": rows,
+        })
+        if progress:
+            progress(page_index + 1, len(pages_data))
+    return data.get("title", ""), pages
+
+
+def load_project_file(filename, progress=None):
+    # Returns (title, pages) in the same shape save_project_file takes, for either format.
+    # Panels come back as LazyPanels. progress(done, total) is called per page.
+    if not zipfile.is_zipfile(filename):
+        return load_legacy_project(filename, progress)
+
+    with ProjectArchive(filename) as project:
+        pages = []
+        for page_index, page_data in enumerate(project.pages):
+            rows = []
+            for row_index, row_data in enumerate(page_data.get("rows", [])):
+                rows.append({
+                    "duration": tuple(row_data.get("duration", (0, 0))),
+                    "description": row_data.get("description", ""),
+                    "mode": row_data.get("mode", page_data.get("mode", "upload")),
+                    "panel": project.read_lazy_panel(page_index, row_index),
+                })
+            pages.append({
+                "start_number": page_data.get("start_number"),
+                "mode": page_data.get("mode", "upload"),
+                "rows": rows,
+            })
+            if progress:
+                progress(page_index + 1, len(project.pages))
+        return project.title, pages
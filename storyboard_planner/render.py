@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from storyboard_planner.fonts import get_font
+from storyboard_planner.sprites import COLOR_BLACK, paste_text
+
+# Playback frames (letterboxed panel plus cut number) are rendered ahead on a worker thread
+PLAYBACK_LOOKAHEAD = 3
+# Frames kept around, counting the look-ahead ones, for seeking back and forth
+PLAYBACK_FRAME_CACHE = 8
+
+
+def fit_size(width, height, target_w, target_h):
+    # Largest size with the same aspect ratio that fits inside the target
+    ratio = width / height
+    if ratio > target_w / target_h:
+        return target_w, max(1, int(target_w / ratio))
+    return max(1, int(target_h * ratio)), target_h
+
+
+def compose_cut_frame(panel, size, number, description=""):
+    # Everything that stays put for the whole cut; the running timecode is drawn over it separately
+    target_w, target_h = size
+    bg = Image.new("RGBA", (target_w, target_h), COLOR_BLACK)
+
+    if panel is not None:
+        new_w, new_h = fit_size(panel.width, panel.height, target_w, target_h)
+        resized_img = panel.resize((new_w, new_h), Image.LANCZOS)
+        bg.paste(resized_img, ((target_w - new_w) // 2, (target_h - new_h) // 2))
+
+    # Draw storyboard number on top-left
+    font_size = max(10, target_h // 20)
+    font = get_font(font_size)
+
+    text = f"Cut no. {number}"
+    margin = 10
+    paste_text(bg, (margin, margin), text, font, 1)
+
+    # Draw description bottom-right
+    if description:
+        desc_font_size = max(18, target_h // 30)
+        desc_font = get_font(desc_font_size)
+        desc_margin = 15
+        bbox = desc_font.getbbox(description)
+        desc_pos = (target_w - desc_margin - (bbox[2] - bbox[0]), target_h - desc_margin - (bbox[3] - bbox[1]))
+        paste_text(bg, desc_pos, description, desc_font, 1)
+    return bg
+
+
+class FramePrefetcher:
+    # Renders frames for (index, size) keys on one worker thread. Finished frames stay in a small LRU so seeking
+    # back to a cut that was just on screen does not render it again. on_ready(index, size, frame) is called from
+    # the worker thread as each frame is finished.
+    def __init__(self, render_callback, on_ready, capacity=PLAYBACK_FRAME_CACHE):
+        self.render_callback = render_callback
+        self.on_ready = on_ready
+        self.capacity = capacity
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="playback-frames")
+        self.futures = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def request(self, index, size):
+        key = (index, tuple(size))
+        future = self.futures.get(key)
+        if future is None:
+            future = self.executor.submit(self.render_callback, index, key[1])
+            future.add_done_callback(lambda future, key=key: self.finished(key, future))
+            self.futures[key] = future
+        self.futures.move_to_end(key)
+        return future
+
+    def finished(self, key, future):
+        on_ready = self.on_ready
+        if on_ready is not None and not future.cancelled() and future.exception() is None:
+            on_ready(key[0], key[1], future.result())
+
+    def get(self, index, size, upcoming=()):
+        # Frame for index if the worker has finished it, otherwise None and on_ready hears about it once it is.
+        # Never waits on the worker. The upcoming cuts are queued behind it.
+        future = self.request(index, size)
+        frame = None
+        if future.done() and not future.cancelled() and future.exception() is None:
+            self.hits += 1
+            frame = future.result()
+        else:
+            self.misses += 1
+
+        wanted = {(ahead, tuple(size)) for ahead in upcoming}
+        wanted.add((index, tuple(size)))
+        for key in list(self.futures):
+            if key not in wanted and not self.futures[key].done():
+                # Queued for a play head that has moved on (a seek, or a scrub past it)
+                self.futures.pop(key).cancel()
+        for ahead in upcoming:
+            self.request(ahead, size)
+        self.futures.move_to_end((index, tuple(size)))
+
+        finished = [key for key, f in self.futures.items() if f.done() and key not in wanted]
+        for key in finished[:max(0, len(self.futures) - self.capacity)]:
+            del self.futures[key]
+        return frame
+
+    def invalidate(self):
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+
+    def shutdown(self):
+        # A frame the worker is still on is dropped when it finishes
+        self.on_ready = None
+        self.invalidate()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,161 @@
+from PIL import Image, ImageDraw
+
+from storyboard_planner.fonts import get_font
+from storyboard_planner.render import fit_size
+
+# PIL versions of the printed spread and contact sheet
+SHEET_BACKGROUND = (255, 255, 255, 255)
+SHEET_LINE = (160, 160, 160, 255)
+SHEET_TEXT = (0, 0, 0, 255)
+SHEET_HEADER = (235, 235, 235, 255)
+
+PAGE_ROW_HEIGHT = 180
+PAGE_COLUMNS = (("#", 64), ("Storyboard", 320), ("Description", 360), ("Duration", 140))
+PAGE_HEADER_HEIGHT = 32
+PAGE_FOOTER_HEIGHT = 36
+SPREAD_TITLE_HEIGHT = 48
+SPREAD_GAP = 24
+
+CONTACT_COLUMNS = 5
+CONTACT_ROWS = 6
+CONTACT_THUMB_SIZE = (320, 180)
+CONTACT_CAPTION_HEIGHT = 28
+CONTACT_GAP = 16
+
+
+def total_frames(duration, fps):
+    s, f = duration
+    return s * fps + f
+
+
+def format_duration(frames, fps):
+    return f"{frames // fps} s + {frames % fps} f"
+
+
+def paste_fitted(image, panel, box):
+    # Letterbox a panel into box = (left, top, right, bottom)
+    left, top, right, bottom = box
+    if panel is None:
+        return
+    new_w, new_h = fit_size(panel.width, panel.height, right - left, bottom - top)
+    thumb = panel.resize((new_w, new_h), Image.LANCZOS)
+    image.paste(thumb, (left + (right - left - new_w) // 2, top + (bottom - top - new_h) // 2))
+
+
+def draw_wrapped(draw, box, text, font):
+    # Word wrapped text inside box, lines that do not fit are dropped
+    left, top, right, bottom = box
+    line_height = font.size + 4
+    lines = []
+    for paragraph in text.splitlines():
+        line = ""
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            if line and draw.textlength(candidate, font=font) > right - left:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    y = top
+    for line in lines:
+        if y + line_height > bottom:
+            break
+        draw.text((left, y), line, font=font, fill=SHEET_TEXT)
+        y += line_height
+
+
+def render_page(page, fps):
+    rows = page["rows"]
+    width = sum(w for _, w in PAGE_COLUMNS)
+    height = PAGE_HEADER_HEIGHT + len(rows) * PAGE_ROW_HEIGHT + PAGE_FOOTER_HEIGHT
+    image = Image.new("RGBA", (width, height), SHEET_BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    font = get_font(18)
+    small_font = get_font(16)
+
+    draw.rectangle((0, 0, width - 1, PAGE_HEADER_HEIGHT), fill=SHEET_HEADER, outline=SHEET_LINE)
+    x = 0
+    for label, column_width in PAGE_COLUMNS:
+        draw.text((x + column_width // 2, PAGE_HEADER_HEIGHT // 2), label, font=font, fill=SHEET_TEXT, anchor="mm")
+        x += column_width
+
+    page_frames = 0
+    for row_index, row in enumerate(rows):
+        top = PAGE_HEADER_HEIGHT + row_index * PAGE_ROW_HEIGHT
+        bottom = top + PAGE_ROW_HEIGHT
+        frames = total_frames(row["duration"], fps)
+        page_frames += frames
+
+        x = 0
+        cells = []
+        for _, column_width in PAGE_COLUMNS:
+            cells.append((x, top, x + column_width, bottom))
+            draw.rectangle((x, top, x + column_width - 1, bottom - 1), outline=SHEET_LINE)
+            x += column_width
+
+        number = page["start_number"] + row_index
+        draw.text(((cells[0][0] + cells[0][2]) // 2, (top + bottom) // 2), str(number), font=font, fill=SHEET_TEXT,
+                  anchor="mm")
+        paste_fitted(image, row.get("panel"), (cells[1][0] + 1, top + 1, cells[1][2] - 1, bottom - 1))
+        draw_wrapped(draw, (cells[2][0] + 8, top + 8, cells[2][2] - 8, bottom - 8), row["description"], small_font)
+        s, f = row["duration"]
+        draw.text(((cells[3][0] + cells[3][2]) // 2, (top + bottom) // 2), f"{s} s + {f} f", font=font,
+                  fill=SHEET_TEXT, anchor="mm")
+
+    total = f"Total Duration: {format_duration(page_frames, fps)}"
+    draw.text((width - 8, height - PAGE_FOOTER_HEIGHT // 2), total, font=font, fill=SHEET_TEXT, anchor="rm")
+    return image
+
+
+def render_spreads(title, pages, fps):
+    # One image per pair of pages, like the spreads the app shows and exports
+    spreads = []
+    for index in range(0, len(pages), 2):
+        page_images = [render_page(page, fps) for page in pages[index:index + 2]]
+        width = sum(p.width for p in page_images) + SPREAD_GAP * (len(page_images) + 1)
+        height = max(p.height for p in page_images) + SPREAD_TITLE_HEIGHT + SPREAD_GAP
+        spread = Image.new("RGBA", (width, height), SHEET_BACKGROUND)
+        draw = ImageDraw.Draw(spread)
+        heading = f"Spread {index // 2 + 1} / {(len(pages) + 1) // 2}"
+        if title:
+            heading = f"{title} - {heading}"
+        draw.text((SPREAD_GAP, SPREAD_TITLE_HEIGHT // 2 + 6), heading, font=get_font(24), fill=SHEET_TEXT,
+                  anchor="lm")
+        x = SPREAD_GAP
+        for page_image in page_images:
+            spread.paste(page_image, (x, SPREAD_TITLE_HEIGHT))
+            x += page_image.width + SPREAD_GAP
+        spreads.append(spread.convert("RGB"))
+    return spreads
+
+
+def render_contact_sheets(title, cuts, fps, columns=CONTACT_COLUMNS, rows=CONTACT_ROWS):
+    # cuts: [(panel, duration, number, description)]. One image per columns x rows cuts
+    thumb_w, thumb_h = CONTACT_THUMB_SIZE
+    cell_w = thumb_w + CONTACT_GAP
+    cell_h = thumb_h + CONTACT_CAPTION_HEIGHT + CONTACT_GAP
+    per_sheet = columns * rows
+    font = get_font(16)
+    sheets = []
+    for start in range(0, len(cuts), per_sheet):
+        chunk = cuts[start:start + per_sheet]
+        used_rows = (len(chunk) + columns - 1) // columns
+        sheet = Image.new("RGBA", (columns * cell_w + CONTACT_GAP, SPREAD_TITLE_HEIGHT + used_rows * cell_h),
+                          SHEET_BACKGROUND)
+        draw = ImageDraw.Draw(sheet)
+        sheet_count = (len(cuts) + per_sheet - 1) // per_sheet
+        heading = f"Sheet {start // per_sheet + 1} / {sheet_count}"
+        if title:
+            heading = f"{title} - {heading}"
+        draw.text((CONTACT_GAP, SPREAD_TITLE_HEIGHT // 2 + 6), heading, font=get_font(24), fill=SHEET_TEXT,
+                  anchor="lm")
+        for offset, (panel, duration, number, description) in enumerate(chunk):
+            left = CONTACT_GAP + (offset % columns) * cell_w
+            top = SPREAD_TITLE_HEIGHT + (offset // columns) * cell_h
+            draw.rectangle((left - 1, top - 1, left + thumb_w, top + thumb_h), fill=(0, 0, 0, 255))
+            paste_fitted(sheet, panel, (left, top, left + thumb_w, top + thumb_h))
+            caption = f"#{number}  {format_duration(total_frames(duration, fps), fps)}"
+            draw.text((left, top + thumb_h + 4), caption, font=font, fill=SHEET_TEXT)
+        sheets.append(sheet.convert("RGB"))
+    return sheets
@@ -0,0 +1,134 @@
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw
+
+from storyboard_planner.tiles import COLOR_WHITE
+
+COLOR_BLACK = (0, 0, 0, 255)
+TRANSPARENT = (0, 0, 0, 0)
+
+# Repeating labels are rendered once, the timecode is put together from pre-rendered glyphs
+TEXT_SPRITE_CACHE_SIZE = 256
+
+
+def draw_shadowed_text(draw, pos, text, font, shadow):
+    # White text over four black copies offset diagonally by `shadow` pixels
+    x, y = pos
+    for offset in [(-shadow, -shadow), (-shadow, shadow), (shadow, -shadow), (shadow, shadow)]:
+        draw.text((x + offset[0], y + offset[1]), text, font=font, fill=COLOR_BLACK)
+    draw.text((x, y), text, font=font, fill=COLOR_WHITE)
+
+
+def text_layer(text, font, shadow):
+    # Shadowed text on its own small transparent image. Returns (image, (dx, dy)) where (dx, dy) is where the
+    # image goes relative to the position the text would have been drawn at.
+    left, top, right, bottom = font.getbbox(text)
+    left, top = left - shadow, top - shadow
+    layer = Image.new("RGBA", (max(1, right + shadow - left), max(1, bottom + shadow - top)), TRANSPARENT)
+    draw_shadowed_text(ImageDraw.Draw(layer), (-left, -top), text, font, shadow)
+    return layer, (left, top)
+
+
+class GlyphSprite:
+    __slots__ = ("shadow_image", "fill_image", "offset", "advance")
+
+    def __init__(self, char, font, shadow):
+        self.advance = font.getlength(char)
+        left, top, right, bottom = font.getbbox(char)
+        if right <= left or bottom <= top:
+            # Nothing to draw, e.g. a space
+            self.shadow_image = self.fill_image = None
+            self.offset = (0, 0)
+            return
+        size = (right - left + 2 * shadow, bottom - top + 2 * shadow)
+        origin = (shadow - left, shadow - top)
+        self.shadow_image = Image.new("RGBA", size, TRANSPARENT)
+        draw = ImageDraw.Draw(self.shadow_image)
+        for offset in [(-shadow, -shadow), (-shadow, shadow), (shadow, -shadow), (shadow, shadow)]:
+            draw.text((origin[0] + offset[0], origin[1] + offset[1]), char, font=font, fill=COLOR_BLACK)
+        self.fill_image = Image.new("RGBA", size, TRANSPARENT)
+        ImageDraw.Draw(self.fill_image).text(origin, char, font=font, fill=COLOR_WHITE)
+        self.offset = (left - shadow, top - shadow)
+
+
+class TextSprites:
+    def __init__(self, capacity=TEXT_SPRITE_CACHE_SIZE):
+        self.capacity = capacity
+        self.strings = OrderedDict()  # (font, shadow, text) -> (image, offset)
+        self.glyphs = {}  # (font, shadow, char) -> GlyphSprite
+        self.hits = 0
+        self.misses = 0
+        # Export renders on worker threads
+        self.lock = threading.Lock()
+
+    def layer(self, text, font, shadow):
+        # Whole string with proper layout, rendered once and kept in an LRU
+        key = (font, shadow, text)
+        with self.lock:
+            layer = self.strings.get(key)
+            if layer is not None:
+                self.strings.move_to_end(key)
+                self.hits += 1
+                return layer
+            self.misses += 1
+            layer = text_layer(text, font, shadow)
+            self.strings[key] = layer
+            while len(self.strings) > self.capacity:
+                self.strings.popitem(last=False)
+            return layer
+
+    def glyph(self, char, font, shadow):
+        key = (font, shadow, char)
+        sprite = self.glyphs.get(key)
+        if sprite is None:
+            self.misses += 1
+            sprite = self.glyphs[key] = GlyphSprite(char, font, shadow)
+        else:
+            self.hits += 1
+        return sprite
+
+    def glyph_layer(self, text, font, shadow):
+        # Same result as layer() for text that changes all the time, put together from cached glyphs
+        with self.lock:
+            placed = []
+            pen = 0.0
+            for char in text:
+                sprite = self.glyph(char, font, shadow)
+                if sprite.fill_image is not None:
+                    placed.append((sprite, round(pen) + sprite.offset[0], sprite.offset[1]))
+                pen += sprite.advance
+        if not placed:
+            return Image.new("RGBA", (1, 1), TRANSPARENT), (0, 0)
+
+        left = min(x for sprite, x, y in placed)
+        top = min(y for sprite, x, y in placed)
+        right = max(x + sprite.fill_image.width for sprite, x, y in placed)
+        bottom = max(y + sprite.fill_image.height for sprite, x, y in placed)
+        layer = Image.new("RGBA", (right - left, bottom - top), TRANSPARENT)
+        # All shadows first so no shadow lands on a neighbouring glyph's fill
+        for sprite, x, y in placed:
+            layer.alpha_composite(sprite.shadow_image, (x - left, y - top))
+        for sprite, x, y in placed:
+            layer.alpha_composite(sprite.fill_image, (x - left, y - top))
+        return layer, (left, top)
+
+
+text_sprites = TextSprites()
+
+
+def paste_text(image, pos, text, font, shadow, glyphs=False):
+    # Composite shadowed text onto an RGBA image as if drawn at pos, clipped to the image
+    if glyphs:
+        layer, (dx, dy) = text_sprites.glyph_layer(text, font, shadow)
+    else:
+        layer, (dx, dy) = text_sprites.layer(text, font, shadow)
+    x, y = pos[0] + dx, pos[1] + dy
+    crop_left, crop_top = max(0, -x), max(0, -y)
+    crop_right = min(layer.width, image.width - x)
+    crop_bottom = min(layer.height, image.height - y)
+    if crop_right <= crop_left or crop_bottom <= crop_top:
+        return
+    if (crop_left, crop_top, crop_right, crop_bottom) != (0, 0, layer.width, layer.height):
+        layer = layer.crop((crop_left, crop_top, crop_right, crop_bottom))
+    image.alpha_composite(layer, (x + crop_left, y + crop_top))
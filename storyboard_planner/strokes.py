@@ -0,0 +1,163 @@
+import struct
+import sys
+from array import array
+
+from PIL import Image, ImageDraw
+
+from storyboard_planner.tiles import TiledImage, COLOR_WHITE
+
+# Drawings are kept as strokes so each consumer can rasterise them at its own size. Points are in the
+# original canvas's pixels
+STROKES_MAGIC = b"CSBS"
+STROKES_HEADER = struct.Struct("<4sHHII")
+
+
+def pack_color(color):
+    r, g, b, a = color
+    return (r << 24) | (g << 16) | (b << 8) | a
+
+
+def unpack_color(value):
+    return (value >> 24) & 0xFF, (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF
+
+
+class StrokeList:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.points = array("h")   # x0, y0, x1, y1, ... for every stroke back to back
+        self.starts = array("I")   # index of each stroke's first point
+        self.widths = array("H")
+        self.colors = array("I")
+        self.erasers = array("B")
+
+    def __len__(self):
+        return len(self.starts)
+
+    def begin(self, color, width, eraser=False):
+        self.starts.append(len(self.points) // 2)
+        self.widths.append(width)
+        self.colors.append(pack_color(color))
+        self.erasers.append(1 if eraser else 0)
+
+    def add_points(self, points):
+        for x, y in points:
+            self.points.append(x)
+            self.points.append(y)
+
+    def stroke_points(self, index):
+        start = self.starts[index] * 2
+        end = self.starts[index + 1] * 2 if index + 1 < len(self.starts) else len(self.points)
+        coords = self.points[start:end]
+        return list(zip(coords[0::2], coords[1::2]))
+
+    def pop_stroke(self):
+        index = len(self.starts) - 1
+        stroke = (self.stroke_points(index), unpack_color(self.colors[index]),
+                  self.widths[index], bool(self.erasers[index]))
+        del self.points[self.starts[index] * 2:]
+        for column in (self.starts, self.widths, self.colors, self.erasers):
+            column.pop()
+        return stroke
+
+    def append_stroke(self, points, color, width, eraser):
+        self.begin(color, width, eraser)
+        self.add_points(points)
+
+    def copy(self):
+        strokes = StrokeList(self.width, self.height)
+        for name in ("points", "starts", "widths", "colors", "erasers"):
+            setattr(strokes, name, array(getattr(self, name).typecode, getattr(self, name)))
+        return strokes
+
+    def render(self, image):
+        # Rasterise every stroke onto image, scaled from the canvas size to the image size
+        scale_x = image.width / self.width
+        scale_y = image.height / self.height
+        scale = min(scale_x, scale_y)
+        draw = ImageDraw.Draw(image)
+        for index in range(len(self.starts)):
+            points = [(x * scale_x, y * scale_y) for x, y in self.stroke_points(index)]
+            if not points:
+                continue
+            fill = COLOR_WHITE if self.erasers[index] else unpack_color(self.colors[index])
+            width = max(1, round(self.widths[index] * scale))
+            radius = width / 2
+            x, y = points[0]
+            draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=fill)
+            if len(points) > 1:
+                draw.line(points, fill=fill, width=width, joint="curve")
+        return image
+
+    def to_bytes(self):
+        columns = [self.starts, self.widths, self.colors, self.erasers, self.points]
+        if sys.byteorder == "big":
+            columns = [array(column.typecode, column) for column in columns]
+            for column in columns:
+                column.byteswap()
+        header = STROKES_HEADER.pack(STROKES_MAGIC, self.width, self.height, len(self.starts), len(self.points))
+        return header + b"".join(column.tobytes() for column in columns)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, width, height, count, point_values = STROKES_HEADER.unpack_from(data)
+        if magic != STROKES_MAGIC:
+            raise ValueError("Not a stroke list")
+        strokes = cls(width, height)
+        offset = STROKES_HEADER.size
+        for column, length in ((strokes.starts, count), (strokes.widths, count), (strokes.colors, count),
+                               (strokes.erasers, count), (strokes.points, point_values)):
+            size = column.itemsize * length
+            column.frombytes(data[offset:offset + size])
+            offset += size
+            if sys.byteorder == "big":
+                column.byteswap()
+        return strokes
+
+
+class VectorDrawing:
+    # A drawn panel: an optional raster background (an uploaded or legacy image) with strokes on top.
+    # resize() renders at the requested size instead of resampling a fixed-size raster.
+    def __init__(self, strokes, background=None, tiles=None):
+        self.strokes = strokes
+        self.background = background
+        self.tiles = tiles  # raster at canvas size, kept from the editor so it is not re-rendered
+
+    @property
+    def width(self):
+        return self.strokes.width
+
+    @property
+    def height(self):
+        return self.strokes.height
+
+    @property
+    def size(self):
+        return self.strokes.width, self.strokes.height
+
+    def render(self, size, resample=Image.LANCZOS):
+        if self.background is None:
+            image = Image.new("RGBA", size, COLOR_WHITE)
+        elif self.background.size == size:
+            image = self.background.to_image() if isinstance(self.background, TiledImage) else self.background.copy()
+        else:
+            image = self.background.resize(size, resample)
+        if image.mode != "RGBA":
+            image = image.convert("RGBA")
+        return self.strokes.render(image)
+
+    def resize(self, size, resample=Image.LANCZOS):
+        if tuple(size) == self.size:
+            return self.to_image()
+        return self.render(tuple(size), resample)
+
+    def to_tiles(self):
+        if self.tiles is None:
+            self.tiles = TiledImage.from_image(self.render(self.size))
+        return self.tiles
+
+    def to_image(self):
+        return self.to_tiles().to_image()
+
+    def save(self, fp, format=None, **params):
+        self.to_image().save(fp, format, **params)
@@ -0,0 +1,128 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from storyboard_planner.render import fit_size
+
+# Thumbnails are cut from a per-panel mip pyramid keyed by (key, version), so replaced panels just age out
+THUMBNAIL_BASE_SIZE = 768
+THUMBNAIL_MIN_SIZE = 64
+THUMBNAIL_PYRAMIDS = 24
+THUMBNAIL_WORKERS = 2
+
+
+class MipPyramid:
+    __slots__ = ("levels",)
+
+    def __init__(self, panel):
+        width, height = panel.width, panel.height
+        if width > THUMBNAIL_BASE_SIZE or height > THUMBNAIL_BASE_SIZE:
+            width, height = fit_size(width, height, THUMBNAIL_BASE_SIZE, THUMBNAIL_BASE_SIZE)
+        level = panel.resize((max(1, width), max(1, height)), Image.LANCZOS)
+        if level.mode != "RGBA":
+            level = level.convert("RGBA")
+        self.levels = [level]
+        while min(level.size) // 2 >= THUMBNAIL_MIN_SIZE:
+            level = level.reduce(2)
+            self.levels.append(level)
+
+    @property
+    def size(self):
+        return self.levels[0].size
+
+    def level_for(self, width, height):
+        # Smallest level that is still at least width x height, the base level if none is
+        for level in reversed(self.levels):
+            if level.width >= width and level.height >= height:
+                return level
+        return self.levels[0]
+
+    def render(self, width, height, keep_aspect=True):
+        if keep_aspect:
+            width, height = fit_size(self.size[0], self.size[1], width, height)
+        width, height = max(1, width), max(1, height)
+        level = self.level_for(width, height)
+        if level.size == (width, height):
+            return level.copy()
+        return level.resize((width, height), Image.LANCZOS)
+
+
+class ThumbnailService:
+    def __init__(self, workers=THUMBNAIL_WORKERS, capacity=THUMBNAIL_PYRAMIDS):
+        self.workers = workers
+        self.capacity = capacity
+        self.executor = None  # Started on first use
+        self.pyramids = OrderedDict()  # (key, version) -> MipPyramid
+        self.pending = set()  # Requests queued or running
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def request(self, key, version, panel, size, keep_aspect, callback):
+        # Render a size = (width, height) thumbnail of panel on the pool. callback(request, image) is called from
+        # the worker thread with request = (key, version, size, keep_aspect), and image None if the panel could
+        # not be read. Repeated requests are dropped while the first one is still pending.
+        request = (key, version, size, keep_aspect)
+        with self.lock:
+            if request in self.pending:
+                return
+            self.pending.add(request)
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumbnails")
+            self.executor.submit(self.render, request, panel, callback)
+
+    def pyramid(self, key, version, panel):
+        with self.lock:
+            pyramid = self.pyramids.get((key, version))
+            if pyramid is not None:
+                self.pyramids.move_to_end((key, version))
+                self.hits += 1
+                return pyramid
+            self.misses += 1
+
+        pyramid = MipPyramid(panel)
+        self.store(key, version, pyramid)
+        return pyramid
+
+    def store(self, key, version, pyramid):
+        # Also for pyramids made elsewhere, like the bulk import workers
+        with self.lock:
+            self.pyramids[(key, version)] = pyramid
+            self.pyramids.move_to_end((key, version))
+            while len(self.pyramids) > self.capacity:
+                self.pyramids.popitem(last=False)
+
+    def carry_over(self, key, version, new_version):
+        # The panel was replaced by a copy of the same picture (a finished import), its pyramid still fits
+        with self.lock:
+            pyramid = self.pyramids.get((key, version))
+        if pyramid is not None:
+            self.store(key, new_version, pyramid)
+
+    def render(self, request, panel, callback):
+        key, version, size, keep_aspect = request
+        try:
+            image = self.pyramid(key, version, panel).render(size[0], size[1], keep_aspect)
+        except Exception:
+            # A panel that cannot be decoded gets no thumbnail, the callback still hears back so nothing waits on it
+            image = None
+        finally:
+            with self.lock:
+                self.pending.discard(request)
+        callback(request, image)
+
+    def clear(self):
+        with self.lock:
+            self.pyramids.clear()
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+            self.pending.clear()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+thumbnails = ThumbnailService()
@@ -0,0 +1,103 @@
+from PIL import Image
+
+# Panels are a grid of 64x64 tiles, flat tiles are kept as a colour and tiles are shared until replaced
+TILE_SIZE = 64
+COLOR_WHITE = (255, 255, 255, 255)
+
+
+def flatten_tile(tile):
+    # Collapse a tile to its RGBA tuple when every pixel has the same colour
+    extrema = tile.getextrema()
+    if all(low == high for low, high in extrema):
+        return tuple(low for low, _ in extrema)
+    return tile
+
+
+class TiledImage:
+    def __init__(self, width, height, color=COLOR_WHITE, tile_size=TILE_SIZE):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.cols = (width + tile_size - 1) // tile_size
+        self.rows = (height + tile_size - 1) // tile_size
+        self.tiles = [tuple(color)] * (self.cols * self.rows)
+
+    @classmethod
+    def from_image(cls, image, tile_size=TILE_SIZE):
+        if image.mode != "RGBA":
+            image = image.convert("RGBA")
+        tiled = cls(image.width, image.height, tile_size=tile_size)
+        tiled.update_regions(image)
+        return tiled
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    def tile_box(self, index):
+        left = (index % self.cols) * self.tile_size
+        top = (index // self.cols) * self.tile_size
+        return left, top, min(left + self.tile_size, self.width), min(top + self.tile_size, self.height)
+
+    def tiles_in(self, box):
+        left, top, right, bottom = box
+        if left >= right or top >= bottom:
+            return []
+        first_col, last_col = max(0, left // self.tile_size), min(self.cols - 1, (right - 1) // self.tile_size)
+        first_row, last_row = max(0, top // self.tile_size), min(self.rows - 1, (bottom - 1) // self.tile_size)
+        return [row * self.cols + col
+                for row in range(first_row, last_row + 1)
+                for col in range(first_col, last_col + 1)]
+
+    def update_regions(self, image, boxes=None):
+        # Re-read every tile touched by boxes from image, a full-size RGBA image of the same dimensions
+        if boxes is None:
+            indices = range(len(self.tiles))
+        else:
+            indices = set()
+            for box in boxes:
+                indices.update(self.tiles_in(box))
+
+        for index in indices:
+            self.tiles[index] = flatten_tile(image.crop(self.tile_box(index)))
+
+    def copy(self):
+        tiled = TiledImage.__new__(TiledImage)
+        tiled.__dict__.update(self.__dict__)
+        tiled.tiles = list(self.tiles)
+        return tiled
+
+    def uniform_color(self):
+        first = self.tiles[0]
+        if isinstance(first, tuple) and all(tile == first for tile in self.tiles):
+            return first
+        return None
+
+    def to_image(self):
+        color = self.uniform_color()
+        image = Image.new("RGBA", self.size, color or (0, 0, 0, 0))
+        if color:
+            return image
+
+        for index, tile in enumerate(self.tiles):
+            box = self.tile_box(index)
+            if isinstance(tile, tuple):
+                image.paste(tile, box)
+            else:
+                image.paste(tile, box[:2])
+        return image
+
+    def resize(self, size, resample=Image.BICUBIC):
+        color = self.uniform_color()
+        if color:
+            return Image.new("RGBA", size, color)
+        return self.to_image().resize(size, resample)
+
+    def save(self, fp, format=None, **params):
+        self.to_image().save(fp, format, **params)
+
+    @property
+    def nbytes(self):
+        # Pixel memory held by this image; tiles shared with other copies are counted here too
+        dense = {id(tile): tile for tile in self.tiles if not isinstance(tile, tuple)}
+        return sum(tile.width * tile.height * 4 for tile in dense.values()) + 4 * len(self.tiles)
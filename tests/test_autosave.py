@@ -0,0 +1,154 @@
+import os
+import tempfile
+import unittest
+
+from PIL import Image
+
+from storyboard_planner.autosave import (
+    JOURNAL_EXTENSION, AutosaveJournal, empty_row, load_autosave, read_journal, rotate_autosave
+)
+from storyboard_planner.project import PROJECT_EXTENSION, load_project_file
+from storyboard_planner.strokes import StrokeList, VectorDrawing
+from storyboard_planner.tiles import TiledImage
+
+ROWS = 3
+
+
+def blank_pages(count=2):
+    return [{"start_number": page * ROWS + 1, "mode": "upload", "rows": [empty_row() for _ in range(ROWS)]}
+            for page in range(count)]
+
+
+def page_meta(pages):
+    return [{"start_number": page["start_number"], "mode": page["mode"]} for page in pages]
+
+
+def change(page, row, description, panel=None, duration=(1, 0)):
+    return {"page": page, "row": row, "duration": duration, "description": description, "mode": "upload",
+            "panel": panel}
+
+
+def raster(sigma):
+    return TiledImage.from_image(Image.effect_noise((96, 54), sigma).convert("RGBA"))
+
+
+def pixels(panel):
+    return panel.to_image().tobytes()
+
+
+class AutosaveJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.base = os.path.join(self.directory.name, "autosave")
+        self.pages = blank_pages()
+        self.journal = AutosaveJournal(self.base)
+        self.journal.reset("", self.pages)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_journal_replays_over_the_snapshot(self):
+        first, second = raster(10), raster(40)
+        strokes = StrokeList(96, 54)
+        strokes.append_stroke([(1, 1), (90, 50)], (0, 0, 255, 255), 4, False)
+        self.journal.write("Board", page_meta(self.pages), [change(0, 1, "one", first)])
+        self.journal.write("Board", page_meta(self.pages), [change(1, 2, "two", VectorDrawing(strokes))])
+        self.journal.write("Board", page_meta(self.pages), [change(0, 1, "one again", second, (3, 4))])
+        self.assertEqual(len(list(read_journal(self.base + JOURNAL_EXTENSION))), 3)
+
+        title, pages = load_autosave(self.base)
+        self.assertEqual(title, "Board")
+        row = pages[0]["rows"][1]
+        self.assertEqual((row["description"], row["duration"]), ("one again", (3, 4)))
+        self.assertEqual(pixels(row["panel"]), pixels(second))
+        self.assertEqual(pages[1]["rows"][2]["panel"].get().strokes.to_bytes(), strokes.to_bytes())
+        # Rows never written keep the snapshot's
+        self.assertIsNone(pages[0]["rows"][0]["panel"])
+        self.assertEqual(pages[0]["rows"][0]["duration"], (0, 0))
+
+    def test_a_record_only_holds_the_changed_rows(self):
+        self.journal.write("", page_meta(self.pages), [change(0, 0, "a", raster(30))])
+        size = os.path.getsize(self.base + JOURNAL_EXTENSION)
+        self.journal.write("", page_meta(self.pages), [change(0, 1, "b")])
+        self.assertLess(os.path.getsize(self.base + JOURNAL_EXTENSION) - size, 1024)
+
+    def test_torn_final_record_is_ignored(self):
+        self.journal.write("", page_meta(self.pages), [change(0, 0, "kept", raster(20))])
+        size = os.path.getsize(self.base + JOURNAL_EXTENSION)
+        self.journal.write("", page_meta(self.pages), [change(0, 1, "torn", raster(30))])
+        # A crash part-way through the second record
+        with open(self.base + JOURNAL_EXTENSION, "r+b") as f:
+            f.truncate(size + (os.path.getsize(self.base + JOURNAL_EXTENSION) - size) // 2)
+
+        _, pages = load_autosave(self.base)
+        self.assertEqual(pages[0]["rows"][0]["description"], "kept")
+        self.assertEqual(pages[0]["rows"][1]["description"], "")
+        self.assertEqual(len(list(read_journal(self.base + JOURNAL_EXTENSION))), 1)
+
+    def test_torn_record_header_is_ignored(self):
+        self.journal.write("", page_meta(self.pages), [change(0, 0, "kept")])
+        with open(self.base + JOURNAL_EXTENSION, "ab") as f:
+            f.write(b"\x05\x00")
+        _, pages = load_autosave(self.base)
+        self.assertEqual(pages[0]["rows"][0]["description"], "kept")
+
+    def test_compaction_folds_the_journal_into_the_snapshot(self):
+        journal = AutosaveJournal(self.base, compact_every=2)
+        journal.reset("", self.pages)
+        panel = raster(25)
+        journal.write("Board", page_meta(self.pages), [change(0, 2, "first", panel)])
+        self.assertEqual(journal.records, 1)
+        journal.write("Board", page_meta(self.pages), [change(1, 0, "second")])
+        self.assertEqual(journal.records, 0)
+        self.assertEqual(os.path.getsize(self.base + JOURNAL_EXTENSION), 0)
+
+        title, pages = load_project_file(self.base + PROJECT_EXTENSION)
+        self.assertEqual(title, "Board")
+        self.assertEqual(pages[0]["rows"][2]["description"], "first")
+        self.assertEqual(pixels(pages[0]["rows"][2]["panel"]), pixels(panel))
+        self.assertEqual(pages[1]["rows"][0]["description"], "second")
+
+        # Writing goes on from the compacted snapshot
+        journal.write("Board", page_meta(self.pages), [change(0, 0, "third")])
+        _, pages = load_autosave(self.base)
+        self.assertEqual([row["description"] for row in pages[0]["rows"]], ["third", "", "first"])
+
+    def test_new_pages_are_replayed(self):
+        pages = blank_pages(3)
+        self.journal.write("", page_meta(pages), [change(2, 1, "on a new page")])
+        _, loaded = load_autosave(self.base)
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual(loaded[2]["rows"][1]["description"], "on a new page")
+
+
+class RotateAutosaveTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.base = os.path.join(self.directory.name, "autosave")
+        self.previous = os.path.join(self.directory.name, "previous_session")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def session(self, description=None):
+        journal = AutosaveJournal(self.base)
+        pages = blank_pages()
+        journal.reset("", pages)
+        if description:
+            journal.write("", page_meta(pages), [change(0, 0, description)])
+
+    def test_empty_session_keeps_the_one_before(self):
+        self.session("crashed work")
+        self.assertTrue(rotate_autosave(self.base, self.previous))
+        self.session()
+        self.assertFalse(rotate_autosave(self.base, self.previous))
+        _, pages = load_autosave(self.previous)
+        self.assertEqual(pages[0]["rows"][0]["description"], "crashed work")
+
+    def test_nothing_to_rotate(self):
+        self.assertFalse(rotate_autosave(self.base, self.previous))
+        self.assertIsNone(load_autosave(self.previous))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import random
+import unittest
+
+from storyboard_planner.playback import PlaybackClock, Timeline
+
+FPS = 24
+BOARD_SECONDS = 10 * 60
+# The player's timer fires twice per frame
+TICK_INTERVAL = 1 / (FPS * 2)
+
+
+class VirtualClock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+def ten_minute_board(seed=15):
+    # Cuts of up to 8 s with odd frame counts, the last one trimmed so the board is exactly 10 minutes
+    rng = random.Random(seed)
+    durations = []
+    remaining = BOARD_SECONDS * FPS
+    while remaining > 0:
+        frames = min(remaining, rng.randint(1, 7) * FPS + rng.randint(0, FPS - 1))
+        durations.append(divmod(frames, FPS))
+        remaining -= frames
+    return durations
+
+
+def play(timeline, lateness, loop=None, stop_after=None):
+    # Plays the board through PlaybackClock.tick, the call PlayerWindow.update_frame makes on every timer tick,
+    # against a virtual clock. Each tick is scheduled one interval after the previous one actually ran and arrives
+    # lateness() seconds late, so lateness piles up exactly like it would with a counter that adds the interval on
+    # every tick.
+    # Returns (virtual time when playback finished, frames shown on every tick)
+    now = VirtualClock()
+    clock = PlaybackClock(timeline.fps, now=now)
+    clock.start()
+    shown = []
+    while stop_after is None or now.time < stop_after:
+        now.time += TICK_INTERVAL + lateness()
+        frame, finished = clock.tick(timeline.total_frames, loop)
+        if finished:
+            return now.time, shown
+        shown.append(frame)
+    return now.time, shown
+
+
+class PlaybackTimingTest(unittest.TestCase):
+    def setUp(self):
+        self.timeline = Timeline(ten_minute_board(), FPS)
+
+    def test_board_is_ten_minutes(self):
+        self.assertEqual(self.timeline.total_frames, BOARD_SECONDS * FPS)
+
+    def test_on_time_ticks_end_on_time(self):
+        finished, shown = play(self.timeline, lambda: 0.0)
+        self.assertLess(abs(finished - BOARD_SECONDS), TICK_INTERVAL * 1.01)
+        # Two ticks per frame, every frame of the board is shown
+        self.assertEqual(set(shown), set(range(self.timeline.total_frames)))
+
+    def test_late_ticks_do_not_drift(self):
+        # Every tick 0-15 ms late, and now and then a 250 ms stall. Summing the interval per tick would end this
+        # board minutes late, the clock ends it within one late tick.
+        rng = random.Random(11)
+        max_late = 0.25
+
+        def lateness():
+            return max_late if rng.random() < 0.002 else rng.uniform(0, 0.015)
+
+        finished, shown = play(self.timeline, lateness)
+        error = finished - BOARD_SECONDS
+        self.assertGreaterEqual(error, 0)
+        self.assertLess(error, TICK_INTERVAL + max_late)
+        # Late ticks drop frames instead of slowing down, and the play head never goes backwards
+        self.assertEqual(shown, sorted(shown))
+        self.assertEqual(shown[-1], self.timeline.total_frames - 1)
+
+    def test_every_cut_is_shown_in_order(self):
+        rng = random.Random(3)
+        finished, shown = play(self.timeline, lambda: rng.uniform(0, 0.015))
+        cuts = []
+        for frame in shown:
+            index = self.timeline.locate(frame)[0]
+            if not cuts or cuts[-1] != index:
+                cuts.append(index)
+        self.assertEqual(cuts, list(range(len(self.timeline))))
+
+    def test_stall_jumps_ahead_by_the_stalled_frames(self):
+        now = VirtualClock()
+        clock = PlaybackClock(FPS, now=now)
+        clock.start(100)
+        now.time = 0.5
+        self.assertEqual(clock.frame(), 100 + FPS // 2)
+        clock.stop()
+        now.time = 10
+        self.assertEqual(clock.frame(), 100 + FPS // 2)
+
+    def test_end_holds_the_last_frame(self):
+        now = VirtualClock()
+        clock = PlaybackClock(FPS, now=now)
+        clock.start(self.timeline.total_frames - 2)
+        now.time = 1.0
+        self.assertEqual(clock.tick(self.timeline.total_frames), (self.timeline.total_frames - 1, True))
+        self.assertFalse(clock.running)
+        now.time = 5.0
+        self.assertEqual(clock.frame(), self.timeline.total_frames - 1)
+
+    def test_loop_stays_in_its_range(self):
+        # Five minutes of playback with a 7.5 s loop never runs past the loop's end
+        loop = (1000, 1180)
+        finished, shown = play(self.timeline, lambda: 0.003, loop=loop, stop_after=300.0)
+        self.assertTrue(all(frame < loop[1] for frame in shown))
+        self.assertGreaterEqual(min(shown[len(shown) // 2:]), loop[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+
+from PIL import Image
+
+from storyboard_planner.project import (
+    MANIFEST_NAME, LazyPanel, PanelCache, load_project_file, make_lazy_panel, panel_nbytes, save_project_file
+)
+from storyboard_planner.strokes import StrokeList, VectorDrawing
+from storyboard_planner.tiles import TiledImage
+
+
+def png_bytes(size, sigma=64):
+    # Noise, so no tile is flat and every one holds pixels
+    with io.BytesIO() as output:
+        Image.effect_noise(size, sigma).convert("RGBA").save(output, format="PNG")
+        return output.getvalue()
+
+
+def jpeg_bytes(size):
+    with io.BytesIO() as output:
+        Image.effect_noise(size, 32).convert("RGB").save(output, format="JPEG")
+        return output.getvalue()
+
+
+def drawing():
+    strokes = StrokeList(320, 180)
+    strokes.append_stroke([(10, 10), (100, 40), (200, 150)], (255, 0, 0, 255), 6, False)
+    strokes.append_stroke([(50, 120), (60, 20)], (255, 255, 255, 255), 12, True)
+    background = TiledImage.from_image(Image.effect_noise((320, 180), 20).convert("RGBA"))
+    return VectorDrawing(strokes, background=background)
+
+
+def sample_pages():
+    raster = TiledImage.from_image(Image.effect_noise((160, 90), 48).convert("RGBA"))
+    imported = make_lazy_panel(jpeg_bytes((640, 360)), None, (640, 360))
+    rows = [
+        {"duration": (2, 5), "description": "raster", "mode": "upload", "panel": raster},
+        {"duration": (1, 0), "description": "drawn", "mode": "draw", "panel": drawing()},
+        {"duration": (0, 12), "description": "imported", "mode": "upload", "panel": imported},
+        {"duration": (0, 0), "description": "", "mode": "upload", "panel": None},
+    ]
+    return [{"start_number": 1, "mode": "upload", "rows": rows},
+            {"start_number": 5, "mode": "draw", "rows": [dict(rows[0], description="second page")]}]
+
+
+class ProjectFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "board.csbp")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        pages = sample_pages()
+        save_project_file(self.filename, "Title", pages, workers=2)
+        title, loaded = load_project_file(self.filename)
+        self.assertEqual(title, "Title")
+        self.assertEqual([(page["start_number"], page["mode"]) for page in loaded], [(1, "upload"), (5, "draw")])
+        for page, loaded_page in zip(pages, loaded):
+            for row, loaded_row in zip(page["rows"], loaded_page["rows"]):
+                for field in ("duration", "description", "mode"):
+                    self.assertEqual(loaded_row[field], row[field])
+
+        raster, drawn, imported, empty = loaded[0]["rows"]
+        self.assertIsNone(empty["panel"])
+        self.assertIsInstance(raster["panel"], LazyPanel)
+        self.assertEqual(raster["panel"].to_image().tobytes(), pages[0]["rows"][0]["panel"].to_image().tobytes())
+
+        # Strokes come back as strokes, not flattened into the background
+        original = pages[0]["rows"][1]["panel"]
+        decoded = drawn["panel"].get()
+        self.assertIsInstance(decoded, VectorDrawing)
+        self.assertEqual(decoded.strokes.to_bytes(), original.strokes.to_bytes())
+        self.assertEqual(decoded.background.to_image().tobytes(), original.background.to_image().tobytes())
+
+    def test_jpeg_is_stored_as_it_is(self):
+        pages = sample_pages()
+        save_project_file(self.filename, "", pages, workers=1)
+        with zipfile.ZipFile(self.filename) as archive:
+            names = archive.namelist()
+            self.assertIn("panels/0000_02.jpg", names)
+            self.assertEqual(archive.read("panels/0000_02.jpg"), pages[0]["rows"][2]["panel"].png_bytes)
+            self.assertEqual(archive.getinfo("panels/0000_02.jpg").compress_type, zipfile.ZIP_STORED)
+            self.assertIn(MANIFEST_NAME, names)
+        _, loaded = load_project_file(self.filename)
+        imported = loaded[0]["rows"][2]["panel"]
+        # Its size is known from the manifest without decoding it
+        self.assertEqual(imported.size, (640, 360))
+        self.assertEqual(imported.png_bytes, pages[0]["rows"][2]["panel"].png_bytes)
+
+    def test_saving_again_keeps_loaded_bytes(self):
+        save_project_file(self.filename, "", sample_pages(), workers=1)
+        _, loaded = load_project_file(self.filename)
+        copy = os.path.join(self.directory.name, "copy.csbp")
+        save_project_file(copy, "", loaded, workers=1)
+        with zipfile.ZipFile(self.filename) as first, zipfile.ZipFile(copy) as second:
+            for name in first.namelist():
+                if name != MANIFEST_NAME:
+                    self.assertEqual(first.read(name), second.read(name))
+
+    def test_failed_save_leaves_the_old_file_and_no_tmp(self):
+        save_project_file(self.filename, "Old", sample_pages(), workers=1)
+        with open(self.filename, "rb") as f:
+            before = f.read()
+        broken = sample_pages()
+        del broken[1]["rows"][0]["description"]
+        with self.assertRaises(KeyError):
+            save_project_file(self.filename, "New", broken, workers=1)
+        self.assertEqual(os.listdir(self.directory.name), ["board.csbp"])
+        with open(self.filename, "rb") as f:
+            self.assertEqual(f.read(), before)
+
+
+class PanelCacheTest(unittest.TestCase):
+    def test_budget_is_in_bytes(self):
+        panels = [make_lazy_panel(png_bytes((256, 256), 16 + i), None) for i in range(8)]
+        one_panel = panel_nbytes(panels[0].decode())
+        cache = PanelCache(budget=3 * one_panel)
+        for panel in panels:
+            cache.get(panel)
+        self.assertEqual(len(cache.entries), 3)
+        self.assertLessEqual(cache.nbytes, cache.budget)
+        # The oldest ones went first
+        self.assertEqual(list(cache.entries), panels[-3:])
+
+    def test_panel_over_the_budget_is_still_kept(self):
+        cache = PanelCache(budget=1024)
+        panel = make_lazy_panel(png_bytes((256, 256)), None)
+        first = cache.get(panel)
+        self.assertIs(cache.get(panel), first)
+        self.assertEqual(cache.hits, 1)
+
+    def test_clear(self):
+        cache = PanelCache()
+        cache.get(make_lazy_panel(png_bytes((64, 64)), None))
+        cache.clear()
+        self.assertEqual((len(cache.entries), cache.nbytes), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()